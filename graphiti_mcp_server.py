@@ -36,6 +36,8 @@ from graphiti_core.search.search_filters import SearchFilters
 from graphiti_core.utils.maintenance.graph_data_operations import clear_data
 
 from src.tools.entity_relations import get_entity_relations as get_entity_relations_impl
+from src.tools.entity_relations import RELATIONS_PAGE_SIZE
+from src.tools.entity_relations import get_entity_relations_paginated as get_entity_relations_paginated_impl
 from src.tools.traverse_knowledge_graph import traverse_knowledge_graph as traverse_knowledge_graph_impl
 from src.tools.graph_functions import find_paths_between_entities as find_paths_between_entities_impl
 from src.tools.graph_functions import build_subgraph as build_subgraph_impl
@@ -1083,6 +1085,29 @@ async def get_entity_relations(
     return await get_entity_relations_impl(graphiti_client, entity_uuid)
 
 
+@mcp.tool()
+async def get_entity_relations_paginated(
+    entity_uuid: str,
+    limit: int = RELATIONS_PAGE_SIZE,
+    after: str | None = None,
+) -> dict[str, Any] | ErrorResponse:
+    """Get one page of the relationships (edges) connected to a specific entity.
+
+    Use this instead of get_entity_relations for highly connected entities.
+    Edges are ordered by UUID; pass the returned 'next' value as 'after' to
+    fetch the following page. 'next' is null on the last page.
+
+    Args:
+        entity_uuid: UUID of the entity node to get relationships for
+        limit: Maximum number of edges in the page (default: 500)
+        after: The 'next' value of the previous page, omitted for the first page
+    """
+    global graphiti_client
+    return await get_entity_relations_paginated_impl(
+        graphiti_client, entity_uuid, limit=limit, after=after
+    )
+
+
 @mcp.tool()
 async def traverse_knowledge_graph(
     start_node_uuid: str | None = None,
@@ -1147,11 +1172,12 @@ async def find_paths_between_entities(
     Args:
         from_uuid: UUID of the starting entity (get from search_memory_nodes if unknown)
         to_uuid: UUID of the target entity (get from search_memory_nodes if unknown)
-        max_depth: Maximum path length (default: 5, keep low for faster results)
-        max_paths: Maximum number of paths (default: 10)
+        max_depth: Maximum path length (default: 5, max: 8, keep low for faster results)
+        max_paths: Maximum number of paths (default: 10, max: 100)
     
     Returns:
         Dictionary with paths between entities, including all nodes and edges in those paths.
+        node_details and edge_details are lists of objects, each with its own uuid.
         Only Entity nodes and RELATES_TO edges are included (no Episodic nodes or MENTIONS edges).
     """
     global graphiti_client
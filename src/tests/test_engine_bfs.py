@@ -1,5 +1,6 @@
 """Test cases for BFS engine functionality."""
 
+import asyncio
 import pytest
 import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch, Mock
@@ -107,7 +108,7 @@ class TestEngineBFS:
             assert "N1" in result["nodes"]
             assert result["nodes"]["N1"]["uuid"] == "N1"
             assert result["nodes"]["N1"]["name"] == "Node N1"
-            assert sess.visited == ["N1"]
+            assert sess.visited == {"N1"}
             # First call adds root to frontier, then processes it (finds no edges)
             assert len(sess.frontier) == 0  # Processed and removed
             assert has_more is False
@@ -228,6 +229,60 @@ class TestEngineBFS:
             assert sess.frontier[0].node_uuid == "N1"
             assert sess.frontier[0].next_edge_index > 0
     
+    @pytest.mark.asyncio
+    async def test_oversized_edge_still_makes_progress(self, mock_graphiti, mock_functions):
+        """Test that an edge larger than the whole budget is returned on its own page."""
+        edges_n1 = [FakeEdge("N1", "N2", fact="x" * 4000), FakeEdge("N1", "N3")]
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            sess = TraverseSession(root_uuid="N1", max_depth=1, query_hash="N1:1")
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                budget=TokenBudget(limit=300),
+                **mock_functions
+            )
+            
+            assert [e["target"] for e in result["edges"]] == ["N2"]
+            assert has_more is True
+            assert sess.frontier[0].next_edge_index == 1
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                budget=TokenBudget(limit=300),
+                **mock_functions
+            )
+            
+            assert [e["target"] for e in result["edges"]] == ["N3"]
+            assert has_more is False
+    
+    @pytest.mark.asyncio
+    async def test_resumed_frame_reuses_fetched_edges(self, mock_graphiti, mock_functions):
+        """Test that a frame interrupted by the budget is not re-queried on the next page."""
+        edges_n1 = [FakeEdge("N1", f"N{i}") for i in range(2, 12)]
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            
+            sess = TraverseSession(root_uuid="N1", max_depth=1, query_hash="N1:1")
+            
+            seen = []
+            has_more = True
+            while has_more:
+                result, has_more, _ = await advance_bfs(
+                    sess, mock_graphiti,
+                    budget=TokenBudget(limit=300),
+                    **mock_functions
+                )
+                seen.extend(edge["target"] for edge in result["edges"])
+            
+            assert sorted(seen) == sorted(f"N{i}" for i in range(2, 12))
+            assert [c.args[1] for c in mock_get_edges.call_args_list] == ["N1"]
+            assert sess.pending_edges is None
+    
     @pytest.mark.asyncio
     async def test_depth_zero_returns_only_node(self, mock_graphiti, mock_functions):
         """Test that depth=0 returns only the node without edges."""
@@ -528,4 +583,264 @@ class TestEngineBFS:
         )
         
         assert result["edges"] == []
-        assert has_more is False
\ No newline at end of file
+        assert has_more is False
+    
+    @pytest.mark.asyncio
+    async def test_flat_node_fetch_bypasses_get_node_by_uuid(self, mock_graphiti, mock_functions):
+        """Test that a flat node fetcher is used instead of get_node_by_uuid."""
+        edges_n1 = [FakeEdge("N1", "N2")]
+        
+        async def get_node_flat_by_uuid(client, uuid):
+            return {"uuid": uuid, "name": f"Flat {uuid}"}
+        
+        get_node = AsyncMock()
+        functions = {**mock_functions, "get_node_by_uuid": get_node}
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            
+            sess = TraverseSession(
+                root_uuid="N1",
+                max_depth=1,
+                strategy="bfs",
+                edge_ordering="uuid",
+                query_hash="N1:1",
+                frontier=[],
+                visited=[],
+                yielded_edges=0,
+            )
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                get_node_flat_by_uuid=get_node_flat_by_uuid,
+                **functions
+            )
+            
+            assert result["nodes"]["N1"] == {"uuid": "N1", "name": "Flat N1"}
+            assert result["nodes"]["N2"] == {"uuid": "N2", "name": "Flat N2"}
+            get_node.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_frontier_edges_fetched_concurrently(self, mock_graphiti, mock_functions):
+        """Test that edges for upcoming frontier frames are fetched together."""
+        graph = {
+            "N1": [FakeEdge("N1", "N2"), FakeEdge("N1", "N3"), FakeEdge("N1", "N4")],
+            "N2": [FakeEdge("N2", "N5")],
+            "N3": [FakeEdge("N3", "N6")],
+            "N4": [FakeEdge("N4", "N7")],
+        }
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def get_edges_for_node(driver, node_uuid):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return graph.get(node_uuid, [])
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   side_effect=get_edges_for_node) as mock_get_edges:
+            sess = TraverseSession(root_uuid="N1", max_depth=2, query_hash="N1:2")
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                **mock_functions
+            )
+            
+            assert has_more is False
+            assert {e["target"] for e in result["edges"]} == {"N2", "N3", "N4", "N5", "N6", "N7"}
+            # N2, N3 and N4 were fetched in one concurrent round, each once
+            assert max_in_flight == 3
+            assert sorted(c.args[1] for c in mock_get_edges.call_args_list) == ["N1", "N2", "N3", "N4"]
+    
+    @pytest.mark.asyncio
+    async def test_frontier_edges_fetched_in_one_batch(self, mock_graphiti, mock_functions):
+        """Test that a batch edge fetcher replaces per-node edge queries."""
+        graph = {
+            "N1": [FakeEdge("N1", "N2"), FakeEdge("N1", "N3")],
+            "N2": [FakeEdge("N2", "N4")],
+        }
+        batches = []
+        
+        async def get_edges_by_node_uuids(client, uuids):
+            batches.append(list(uuids))
+            return {uuid: graph[uuid] for uuid in uuids if uuid in graph}
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            sess = TraverseSession(root_uuid="N1", max_depth=2, query_hash="N1:2")
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                get_edges_by_node_uuids=get_edges_by_node_uuids,
+                **mock_functions
+            )
+            
+            assert has_more is False
+            assert sorted(e["target"] for e in result["edges"]) == ["N2", "N3", "N4"]
+            assert batches == [["N1"], ["N2", "N3"]]
+            mock_get_edges.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_edge_look_ahead_limited_by_budget(self, mock_graphiti, mock_functions):
+        """Test that a nearly full page does not fetch edges of frames it cannot reach."""
+        batches = []
+        
+        async def get_edges_by_node_uuids(client, uuids):
+            batches.append(list(uuids))
+            return {}
+        
+        budget = TokenBudget(limit=1000)
+        budget.edge_estimate = 400  # Room for about two more edges
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", new_callable=AsyncMock):
+            sess = TraverseSession(
+                root_uuid="N1",
+                max_depth=2,
+                query_hash="N1:2",
+                frontier=[Frame(f"N{i}", 1, 0) for i in range(1, 6)],
+                visited=["N1", "N2", "N3", "N4", "N5"],
+            )
+            
+            await advance_bfs(
+                sess, mock_graphiti,
+                get_edges_by_node_uuids=get_edges_by_node_uuids,
+                budget=budget,
+                **mock_functions
+            )
+            
+            assert batches[0] == ["N1", "N2"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_edge_batch_falls_back_to_per_node(self, mock_graphiti, mock_functions):
+        """Test that a failing batch edge fetch falls back to per-node queries."""
+        get_edges_by_node_uuids = AsyncMock(side_effect=RuntimeError("boom"))
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: [FakeEdge("N1", "N2")] if node_uuid == "N1" else []
+            sess = TraverseSession(root_uuid="N1", max_depth=1, query_hash="N1:1")
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                get_edges_by_node_uuids=get_edges_by_node_uuids,
+                **mock_functions
+            )
+            
+            assert [e["target"] for e in result["edges"]] == ["N2"]
+            mock_get_edges.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_failed_node_batch_falls_back_to_per_node(self, mock_graphiti, mock_functions):
+        """Test that a failing batch node fetch does not mark the nodes as missing."""
+        edges_n1 = [FakeEdge("N1", f"N{i}") for i in range(2, 5)]
+        get_nodes_flat_by_uuids = AsyncMock(side_effect=RuntimeError("boom"))
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            sess = TraverseSession(root_uuid="N1", max_depth=1, query_hash="N1:1")
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                get_nodes_flat_by_uuids=get_nodes_flat_by_uuids,
+                **mock_functions
+            )
+            
+            for uuid in ("N2", "N3", "N4"):
+                assert "error" not in result["nodes"][uuid]
+                assert result["nodes"][uuid]["name"] == f"Node {uuid}"
+            # The batch is not retried for every remaining edge of the page
+            get_nodes_flat_by_uuids.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_neighbours_fetched_in_one_batch(self, mock_graphiti, mock_functions):
+        """Test that a frame's unvisited neighbours are fetched with one batch call."""
+        edges_n1 = [FakeEdge("N1", f"N{i}") for i in range(2, 7)] + [FakeEdge("N7", "N1")]
+        batches = []
+        
+        async def get_nodes_flat_by_uuids(client, uuids):
+            batches.append(list(uuids))
+            return {uuid: {"uuid": uuid, "name": f"Batch {uuid}"} for uuid in uuids if uuid != "N4"}
+        
+        get_node = AsyncMock(return_value=None)
+        functions = {**mock_functions, "get_node_by_uuid": get_node}
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            
+            sess = TraverseSession(
+                root_uuid="N1",
+                max_depth=1,
+                query_hash="N1:1",
+                frontier=[Frame("N1", 1, 0)],
+                visited=["N1"],
+            )
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                get_nodes_flat_by_uuids=get_nodes_flat_by_uuids,
+                **functions
+            )
+            
+            assert len(batches) == 1
+            assert sorted(batches[0]) == ["N2", "N3", "N4", "N5", "N6", "N7"]
+            assert result["nodes"]["N7"] == {"uuid": "N7", "name": "Batch N7"}
+            assert result["nodes"]["N4"]["error"] == "Node not found"
+            # A node missing from the batch is not looked up again
+            get_node.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_edge_types_are_interned(self, mock_graphiti, mock_functions):
+        """Test that equal edge types in a page share one string object."""
+        # Built at runtime so the two names are distinct objects
+        edges_n1 = [
+            FakeEdge("N1", "N2", name="".join(["KNOWS", "_OF"])),
+            FakeEdge("N1", "N3", name="".join(["KNOWS", "_OF"])),
+        ]
+        assert edges_n1[0].name is not edges_n1[1].name
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            sess = TraverseSession(root_uuid="N1", max_depth=1, query_hash="N1:1")
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                **mock_functions
+            )
+            
+            first, second = result["edges"]
+            assert first["type"] == "KNOWS_OF"
+            assert first["type"] is second["type"]
+    
+    @pytest.mark.asyncio
+    async def test_edge_ids_for_outgoing_and_incoming_edges(self, mock_graphiti, mock_functions):
+        """Test that edge IDs keep source/target order regardless of direction."""
+        edges_n1 = [FakeEdge("N1", "N2"), FakeEdge("N3", "N1")]
+        
+        with patch("src.tools.engine_bfs.EntityEdge.get_by_node_uuid", 
+                   new_callable=AsyncMock) as mock_get_edges:
+            mock_get_edges.side_effect = lambda driver, node_uuid: edges_n1 if node_uuid == "N1" else []
+            
+            sess = TraverseSession(
+                root_uuid="N1",
+                max_depth=1,
+                strategy="bfs",
+                edge_ordering="uuid",
+                query_hash="N1:1",
+                frontier=[Frame("N1", 1, 0)],
+                visited=["N1"],
+                yielded_edges=0,
+            )
+            
+            result, has_more, tokens = await advance_bfs(
+                sess, mock_graphiti,
+                **mock_functions
+            )
+            
+            assert [e["id"] for e in result["edges"]] == ["E:N3:N1:0", "E:N1:N2:1"]
@@ -17,9 +17,11 @@ from graphiti_core import Graphiti
 from graphiti_core.edges import EntityEdge
 from datetime import datetime
 
+from src.tools import entity_relations
 from src.tools.entity_relations import (
     format_fact_result,
     get_entity_relations,
+    get_entity_relations_paginated,
     ErrorResponse
 )
 
@@ -72,35 +74,20 @@ class TestFormatFactResult:
         edge.source_node_uuid = "project-uuid"
         edge.target_node_uuid = "feature-uuid"
         
-        # Mock hasattr to return False for episodes
-        original_hasattr = hasattr
-        
-        def mock_hasattr(obj, attr):
-            if attr == 'episodes':
-                return False
-            if attr == 'confidence':
-                return False
-            return original_hasattr(obj, attr)
-        
-        import builtins
-        original_builtins_hasattr = builtins.hasattr
-        builtins.hasattr = mock_hasattr
-        
-        try:
-            result = format_fact_result(edge)
-            
-            assert result['uuid'] == "edge-uuid-456"
-            assert result['name'] == "INCLUDES"
-            assert result['fact'] == "Project includes feature"
-            assert result['created_at'] is None
-            assert result['valid_at'] is None
-            assert result['invalid_at'] is None
-            assert result['confidence'] is None
-            assert result['source_uuid'] == "project-uuid"
-            assert result['target_uuid'] == "feature-uuid"
-            assert result['episodes'] == []
-        finally:
-            builtins.hasattr = original_builtins_hasattr
+        edge.episodes = []
+        
+        result = format_fact_result(edge)
+        
+        assert result['uuid'] == "edge-uuid-456"
+        assert result['name'] == "INCLUDES"
+        assert result['fact'] == "Project includes feature"
+        assert result['created_at'] is None
+        assert result['valid_at'] is None
+        assert result['invalid_at'] is None
+        assert result['confidence'] is None
+        assert result['source_uuid'] == "project-uuid"
+        assert result['target_uuid'] == "feature-uuid"
+        assert result['episodes'] == []
 
 
 class TestGetEntityRelations:
@@ -203,6 +190,80 @@ class TestGetEntityRelations:
             assert isinstance(relation['episodes'], list)
 
 
+class TestGetEntityRelationsPaginated:
+    """Test cases for keyset pagination of entity relations."""
+    
+    @staticmethod
+    def make_record(edge_uuid: str) -> dict[str, Any]:
+        return {
+            'uuid': edge_uuid,
+            'source_node_uuid': 'alice-uuid',
+            'target_node_uuid': f'target-{edge_uuid}',
+            'group_id': 'test-group',
+            'name': 'RELATES_TO',
+            'fact': f'fact {edge_uuid}',
+            'episodes': [],
+            'created_at': '2024-01-01T12:00:00',
+            'expired_at': None,
+            'valid_at': None,
+            'invalid_at': None,
+            'attributes': {},
+        }
+    
+    @pytest.fixture
+    def mock_client(self):
+        """Mock client whose driver serves E1..E5 in UUID order."""
+        uuids = ['E1', 'E2', 'E3', 'E4', 'E5']
+        
+        async def execute_query(query, node_uuid, after, limit, **kwargs):
+            remaining = [u for u in uuids if after is None or u > after]
+            return [self.make_record(u) for u in remaining[:limit]], None, None
+        
+        client = MagicMock()
+        client.driver.execute_query = AsyncMock(side_effect=execute_query)
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_page_returns_next_token(self, mock_client):
+        """Test that a full page returns the last UUID as continuation."""
+        page = await get_entity_relations_paginated(mock_client, 'alice-uuid', limit=2)
+        
+        assert [e['uuid'] for e in page['edges']] == ['E1', 'E2']
+        assert page['next'] == 'E2'
+        
+        page = await get_entity_relations_paginated(
+            mock_client, 'alice-uuid', limit=2, after=page['next']
+        )
+        assert [e['uuid'] for e in page['edges']] == ['E3', 'E4']
+    
+    @pytest.mark.asyncio
+    async def test_short_page_ends_pagination(self, mock_client):
+        """Test that the final short page has no continuation."""
+        page = await get_entity_relations_paginated(
+            mock_client, 'alice-uuid', limit=2, after='E4'
+        )
+        
+        assert [e['uuid'] for e in page['edges']] == ['E5']
+        assert page['next'] is None
+    
+    @pytest.mark.asyncio
+    async def test_get_entity_relations_walks_all_pages(self, mock_client, monkeypatch):
+        """Test that get_entity_relations concatenates every page."""
+        monkeypatch.setattr(entity_relations, 'RELATIONS_PAGE_SIZE', 2)
+        
+        result = await get_entity_relations(mock_client, 'alice-uuid')
+        
+        assert [e['uuid'] for e in result] == ['E1', 'E2', 'E3', 'E4', 'E5']
+        assert mock_client.driver.execute_query.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_invalid_limit(self, mock_client):
+        """Test that a non-positive limit is rejected."""
+        result = await get_entity_relations_paginated(mock_client, 'alice-uuid', limit=0)
+        
+        assert 'error' in result
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v", "--asyncio-mode=auto"])
\ No newline at end of file
@@ -80,10 +80,11 @@ class TestFindPathsBetweenEntities:
         
         # Check node details
         assert 'node_details' in result
-        assert from_uuid in result['node_details']
-        assert to_uuid in result['node_details']
-        assert result['node_details'][from_uuid]['name'] == "Alice Smith"
-        assert result['node_details'][to_uuid]['name'] == "Bob Johnson"
+        node_details = {node['uuid']: node for node in result['node_details']}
+        assert from_uuid in node_details
+        assert to_uuid in node_details
+        assert node_details[from_uuid]['name'] == "Alice Smith"
+        assert node_details[to_uuid]['name'] == "Bob Johnson"
         
         # Check edge details
         assert 'edge_details' in result
@@ -208,6 +209,92 @@ class TestFindPathsBetweenEntities:
         assert isinstance(result, dict)
         assert 'error' in result
         assert 'not initialized' in result['error'].lower()
+    
+    @pytest.mark.asyncio
+    async def test_same_start_and_end_skips_query(self):
+        """Test that identical endpoints return the trivial path without querying."""
+        client = Mock()
+        client.driver.execute_query = AsyncMock()
+        
+        result = await find_paths_between_entities(
+            graphiti_client=client,
+            from_uuid="uuid1",
+            to_uuid="uuid1",
+        )
+        
+        client.driver.execute_query.assert_not_called()
+        assert result['paths'] == [
+            {'path_id': 1, 'length': 0, 'node_sequence': ['uuid1'], 'edge_sequence': []}
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_limits_rejected(self):
+        """Test that non-positive depth or path limits return an error."""
+        client = Mock()
+        client.driver.execute_query = AsyncMock()
+        
+        for kwargs in ({'max_depth': 0}, {'max_paths': 0}):
+            result = await find_paths_between_entities(
+                client, "uuid1", "uuid2", **kwargs
+            )
+            assert 'error' in result
+        client.driver.execute_query.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_limits_are_clamped(self):
+        """Test that oversized depth and path limits are capped."""
+        client = Mock()
+        client.driver.execute_query = AsyncMock(return_value=([], None, None))
+        
+        result = await find_paths_between_entities(
+            client, "uuid1", "uuid2", max_depth=50, max_paths=10_000
+        )
+        
+        query = client.driver.execute_query.call_args.args[0]
+        assert "*1..8]" in query
+        assert client.driver.execute_query.call_args.kwargs['max_paths'] == 100
+        assert result['metadata']['max_depth'] == 8
+    
+    @pytest.mark.asyncio
+    async def test_details_deduplicated_without_embeddings(self):
+        """Test that shared nodes and edges are returned once and without embeddings."""
+        def node(uuid):
+            return {
+                'uuid': uuid, 'name': uuid, 'group_id': 'g', 'summary': '',
+                'created_at': '2024-01-01T00:00:00+00:00', 'labels': ['Entity'],
+                'attributes': {'uuid': uuid, 'role': 'x', 'name_embedding': None,
+                               'summary_embedding': None},
+            }
+        
+        def edge(uuid, source, target):
+            return {
+                'uuid': uuid, 'group_id': 'g', 'name': 'RELATES_TO', 'fact': 'f',
+                'episodes': [], 'created_at': '2024-01-01T00:00:00+00:00',
+                'expired_at': None, 'valid_at': None, 'invalid_at': None,
+                'source_node_uuid': source, 'target_node_uuid': target,
+                'attributes': {'fact_embedding': None},
+            }
+        
+        record = {
+            'paths': [
+                {'path_length': 1, 'node_uuids': ['A', 'B'], 'edge_uuids': ['E1']},
+                {'path_length': 2, 'node_uuids': ['A', 'C', 'B'], 'edge_uuids': ['E2', 'E3']},
+            ],
+            'node_records': [node('A'), node('B'), node('C')],
+            'edge_records': [edge('E1', 'A', 'B'), edge('E2', 'A', 'C'), edge('E3', 'C', 'B')],
+        }
+        client = Mock()
+        client.driver.execute_query = AsyncMock(return_value=([record], None, None))
+        
+        result = await find_paths_between_entities(client, "A", "B")
+        
+        assert [p['node_sequence'] for p in result['paths']] == [['A', 'B'], ['A', 'C', 'B']]
+        assert [n['uuid'] for n in result['node_details']] == ['A', 'B', 'C']
+        assert [e['uuid'] for e in result['edge_details']] == ['E1', 'E2', 'E3']
+        assert result['node_details'][0]['attributes'] == {'role': 'x'}
+        assert 'name_embedding' not in result['node_details'][0]
+        assert result['edge_details'][0]['attributes'] == {}
+        assert 'fact_embedding' not in result['edge_details'][0]
 
 
 class TestBuildSubgraph:
@@ -185,15 +185,25 @@ class TestIntegration:
                 class SmallBudget:
                     def __init__(self, limit=20000):
                         self.edge_count = 0
+                        self.used = 0
                         self.limit = limit  # Add limit attribute
                         self.max_tokens = limit  # Add max_tokens alias
                     
-                    def can_add_edge(self, result, edge):
+                    def set_current_state(self, state):
+                        pass
+                    
+                    def can_add_edge(self, edge, node=None):
                         # Allow root node and 1 edge per page
-                        if self.edge_count >= 1:
-                            return False
+                        return self.edge_count < 1
+                    
+                    def add_edge(self, edge, node=None):
                         self.edge_count += 1
+                    
+                    def can_add_edge_cheap(self, edge_tokens=None):
                         return True
+                    
+                    def edges_remaining(self):
+                        return max(0, 1 - self.edge_count)
                 
                 # Use side_effect to create new instance each time
                 MockBudget.side_effect = lambda: SmallBudget()
@@ -1,8 +1,13 @@
 """Test cases for SessionStore functionality."""
 
+import base64
+import hashlib
+import hmac
+import json
 import pytest
 import pytest_asyncio
 import time
+from collections import deque
 from datetime import datetime, timedelta
 from freezegun import freeze_time
 from typing import Dict, Any
@@ -10,12 +15,78 @@ from typing import Dict, Any
 # Import the module we'll implement
 from src.tools.session_store import (
     SessionStore,
+    RedisSessionStore,
     TraverseSession,
     Frame,
     CursorExpired,
     InvalidCursor,
     SessionNotFound,
 )
+from src.tools import session_store
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands RedisSessionStore uses."""
+    
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.added = []
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def smembers(self, key):
+        return {m.encode() for m in self.data.get(key, set())}
+    
+    async def scard(self, key):
+        return len(self.data.get(key, set()))
+    
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+
+
+class FakePipeline:
+    """Queues commands and applies them to a FakeRedis on execute()."""
+    
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value, ex))
+    
+    def sadd(self, key, *members):
+        self.commands.append(("sadd", key, set(members)))
+    
+    def expire(self, key, ttl):
+        self.commands.append(("expire", key, ttl))
+    
+    def persist(self, key):
+        self.commands.append(("expire", key, None))
+    
+    async def execute(self):
+        client = self.client
+        for command, key, *args in self.commands:
+            if command == "set":
+                client.data[key] = args[0]
+                client.ttls[key] = args[1]
+            elif command == "sadd":
+                client.data.setdefault(key, set()).update(args[0])
+                client.added.append(args[0])
+            elif key in client.data:
+                client.ttls[key] = args[0]
 
 
 class TestSessionStore:
@@ -58,7 +129,7 @@ class TestSessionStore:
         assert loaded.frontier[0].node_uuid == "N1"
         assert loaded.frontier[0].depth_remaining == 3
         assert loaded.frontier[0].next_edge_index == 0
-        assert loaded.visited == ["N1"]
+        assert loaded.visited == {"N1"}
     
     @pytest.mark.asyncio
     async def test_session_not_found(self, store):
@@ -117,6 +188,27 @@ class TestSessionStore:
         assert "exp" in payload
         assert "iat" in payload
     
+    @pytest.mark.asyncio
+    async def test_legacy_hmac_token_still_verifies(self, store):
+        """Test that unversioned HMAC-SHA256 tokens are still accepted."""
+        payload = {"sid": "legacy", "qh": "N1:3", "iat": int(time.time()), "exp": int(time.time()) + 600}
+        payload_b64 = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii").rstrip("=")
+        signature = hmac.new(store.SECRET_KEY, payload_b64.encode("utf-8"), hashlib.sha256).digest()
+        signature_b64 = base64.urlsafe_b64encode(signature).decode("ascii").rstrip("=")
+        
+        verified = await store.verify_token(f"{payload_b64}.{signature_b64}")
+        assert verified["sid"] == "legacy"
+        
+        # A legacy signature must not validate a current-version payload
+        token_info = await store.issue_token("legacy", "N1:3")
+        current_payload_b64 = token_info["token"].split(".")[0]
+        forged = hmac.new(store.SECRET_KEY, current_payload_b64.encode("utf-8"), hashlib.sha256).digest()
+        forged_b64 = base64.urlsafe_b64encode(forged).decode("ascii").rstrip("=")
+        with pytest.raises(InvalidCursor):
+            await store.verify_token(f"{current_payload_b64}.{forged_b64}")
+    
     @pytest.mark.asyncio
     async def test_token_invalid_signature(self, store):
         """Test verifying token with invalid signature raises InvalidCursor."""
@@ -125,6 +217,19 @@ class TestSessionStore:
         with pytest.raises(InvalidCursor):
             await store.verify_token(invalid_token)
     
+    @pytest.mark.asyncio
+    async def test_unsigned_payload_is_never_decoded(self, store, monkeypatch):
+        """Test that a payload with a bad signature is rejected before it is parsed."""
+        token_info = await store.issue_token("sid", "N1:3")
+        payload_b64, signature_b64 = token_info["token"].split(".")
+        tampered_b64 = base64.urlsafe_b64encode(b'{"sid":"other"}').decode("ascii").rstrip("=")
+        
+        calls = []
+        monkeypatch.setattr(session_store, "loads", lambda data: calls.append(data))
+        with pytest.raises(InvalidCursor):
+            await store.verify_token(f"{tampered_b64}.{signature_b64}")
+        assert calls == []
+    
     @pytest.mark.asyncio
     async def test_token_malformed(self, store):
         """Test verifying malformed token raises InvalidCursor."""
@@ -185,6 +290,99 @@ class TestSessionStore:
             payload2 = await store.verify_token(token2["token"])
             assert payload2["sid"] == sid
     
+    @pytest.mark.asyncio
+    async def test_expired_session_not_loaded(self, store):
+        """Test that a session past its expiry is dropped on load."""
+        with freeze_time("2024-01-01 12:00:00"):
+            sess = TraverseSession(root_uuid="N1", max_depth=1, expires_at=time.time() + 60)
+            await store.save_session("expiring", sess)
+            assert await store.load_session("expiring") is sess
+        
+        with freeze_time("2024-01-01 12:02:00"):
+            assert await store.load_session("expiring") is None
+    
+    @pytest.mark.asyncio
+    async def test_abandoned_sessions_swept_on_save(self, store):
+        """Test that saving a session evicts other sessions that have expired."""
+        with freeze_time("2024-01-01 12:00:00"):
+            old = TraverseSession(root_uuid="N1", max_depth=1, expires_at=time.time() + 60)
+            await store.save_session("abandoned", old)
+        
+        with freeze_time("2024-01-01 12:02:00"):
+            new = TraverseSession(root_uuid="N2", max_depth=1, expires_at=time.time() + 60)
+            await store.save_session("active", new)
+            
+            assert "abandoned" not in store._sessions
+            assert await store.load_session("active") is new
+    
+    @pytest.mark.asyncio
+    async def test_redis_store_round_trip(self):
+        """Test that RedisSessionStore serializes sessions with an expiry."""
+        client = FakeRedis()
+        store = RedisSessionStore(client, prefix="t:")
+        sess = TraverseSession(
+            root_uuid="N1",
+            max_depth=2,
+            frontier=[Frame("N1", 2, 3)],
+            visited=["N1", "N2"],
+            expires_at=time.time() + 600,
+        )
+        
+        await store.save_session("sid", sess)
+        assert 0 < client.ttls["t:sid"] <= 600
+        assert 0 < client.ttls["t:sid:visited"] <= 600
+        assert "visited" not in json.loads(client.data["t:sid"])
+        
+        loaded = await store.load_session("sid")
+        assert loaded.visited == {"N1", "N2"}
+        assert loaded.frontier[0].next_edge_index == 3
+        
+        await store.delete_session("sid")
+        assert await store.load_session("sid") is None
+        assert client.data == {}
+    
+    @pytest.mark.asyncio
+    async def test_redis_store_adds_only_new_visited(self):
+        """Test that each save sends only the uuids visited since the last one."""
+        client = FakeRedis()
+        store = RedisSessionStore(client, prefix="t:")
+        sess = TraverseSession(root_uuid="N1", max_depth=2, visited=["N1", "N2"])
+        await store.save_session("sid", sess)
+        
+        loaded = await store.load_session("sid")
+        loaded.visited.add("N3")
+        await store.save_session("sid", loaded)
+        
+        assert client.added == [{"N1", "N2"}, {"N3"}]
+        assert (await store.load_session("sid")).visited == {"N1", "N2", "N3"}
+    
+    @pytest.mark.asyncio
+    async def test_redis_store_loads_inline_visited(self):
+        """Test that sessions saved with visited inline still load."""
+        client = FakeRedis()
+        store = RedisSessionStore(client, prefix="t:")
+        sess = TraverseSession(root_uuid="N1", max_depth=2, visited=["N1", "N2"])
+        client.data["t:sid"] = json.dumps(sess.to_dict()).encode()
+        
+        loaded = await store.load_session("sid")
+        assert loaded.visited == {"N1", "N2"}
+        
+        await store.save_session("sid", loaded)
+        assert client.data["t:sid:visited"] == {"N1", "N2"}
+    
+    @pytest.mark.asyncio
+    async def test_redis_store_drops_oversized_visited(self):
+        """Test that a session whose visited set outgrew the limit is not loaded."""
+        client = FakeRedis()
+        store = RedisSessionStore(client, prefix="t:", max_visited=2)
+        await store.save_session("small", TraverseSession(root_uuid="N1", max_depth=2, visited=["N1", "N2"]))
+        await store.save_session("large", TraverseSession(root_uuid="N1", max_depth=2, visited=["N1", "N2", "N3"]))
+        
+        assert (await store.load_session("small")).visited == {"N1", "N2"}
+        assert await store.load_session("large") is None
+        assert "t:large" not in client.data
+        assert "t:large:visited" not in client.data
+    
     @pytest.mark.asyncio
     async def test_concurrent_sessions(self, store):
         """Test that multiple sessions can coexist."""
@@ -217,7 +415,7 @@ class TestSessionStore:
             assert loaded is not None
             assert loaded.root_uuid == root
             assert loaded.max_depth == depth
-            assert loaded.visited == visited
+            assert loaded.visited == set(visited)
     
     @pytest.mark.asyncio
     async def test_frame_serialization(self, store):
@@ -253,4 +451,45 @@ class TestSessionStore:
         for i, frame in enumerate(loaded.frontier):
             assert frame.node_uuid == frames[i].node_uuid
             assert frame.depth_remaining == frames[i].depth_remaining
-            assert frame.next_edge_index == frames[i].next_edge_index
\ No newline at end of file
+            assert frame.next_edge_index == frames[i].next_edge_index
+    
+    def test_node_cache_evicts_least_recently_used(self, monkeypatch):
+        """Test that the per-session node cache is bounded with LRU eviction."""
+        monkeypatch.setattr(session_store, "NODE_CACHE_MAXSIZE", 2)
+        sess = TraverseSession(root_uuid="N1", max_depth=1)
+        
+        sess.cache_node("N1", {"uuid": "N1"})
+        sess.cache_node("N2", {"uuid": "N2"})
+        assert sess.get_cached_node("N1") == {"uuid": "N1"}  # N1 now most recent
+        sess.cache_node("N3", {"uuid": "N3"})
+        
+        assert sess.get_cached_node("N2") is None
+        assert sess.get_cached_node("N1") == {"uuid": "N1"}
+        assert sess.get_cached_node("N3") == {"uuid": "N3"}
+    
+    def test_node_cache_not_serialized(self):
+        """Test that cached nodes stay out of the serialized session."""
+        sess = TraverseSession(root_uuid="N1", max_depth=1)
+        sess.cache_node("N1", {"uuid": "N1"})
+        
+        assert "node_cache" not in sess.to_dict()
+    
+    def test_visited_serializes_as_sorted_list(self):
+        """Test that visited is a set in memory and a sorted list when serialized."""
+        sess = TraverseSession(root_uuid="N1", max_depth=1, visited=["N3", "N1", "N2", "N1"])
+        assert sess.visited == {"N1", "N2", "N3"}
+        
+        data = sess.to_dict()
+        assert data["visited"] == ["N1", "N2", "N3"]
+        assert TraverseSession.from_dict(data).visited == {"N1", "N2", "N3"}
+    
+    def test_frontier_is_a_deque(self):
+        """Test that the frontier is held as a deque and serialized as a list."""
+        sess = TraverseSession(root_uuid="N1", max_depth=2, frontier=[Frame("N1", 2, 0), Frame("N2", 1, 0)])
+        assert isinstance(sess.frontier, deque)
+        
+        data = sess.to_dict()
+        assert [f["node_uuid"] for f in data["frontier"]] == ["N1", "N2"]
+        restored = TraverseSession.from_dict(data)
+        assert isinstance(restored.frontier, deque)
+        assert restored.frontier.popleft().node_uuid == "N1"
@@ -7,6 +7,7 @@ from typing import Dict, Any, List
 from src.tools.token_budget import (
     TokenBudget,
     MAX_RESPONSE_TOKENS,
+    DEFAULT_EDGE_TOKEN_ESTIMATE,
     estimate_tokens,
 )
 
@@ -140,9 +141,10 @@ class TestTokenBudget:
         }
         
         # Should be able to add first edge
-        assert budget.can_add_edge(result, edge1) is True
-        result["edges"].append(edge1)
         budget.set_current_state(result)
+        assert budget.can_add_edge(edge1) is True
+        result["edges"].append(edge1)
+        budget.add_edge(edge1)
         
         # Add more edges
         edge2 = {
@@ -154,7 +156,7 @@ class TestTokenBudget:
             }
         }
         
-        assert budget.can_add_edge(result, edge2) is True
+        assert budget.can_add_edge(edge2) is True
     
     def test_token_budget_prevents_overflow_with_edges(self):
         """Test that budget prevents adding edges that would exceed limit."""
@@ -177,7 +179,99 @@ class TestTokenBudget:
         }
         
         # Should not be able to add
-        assert budget.can_add_edge(result, large_edge) is False
+        budget.set_current_state(result)
+        assert budget.can_add_edge(large_edge) is False
+    
+    def test_add_edge_reuses_checked_cost(self, monkeypatch):
+        """Test that add_edge does not re-estimate an edge just checked."""
+        budget = TokenBudget(limit=1000)
+        edge = {"id": "E:N1:N2:0", "fact": "f"}
+        node = {"uuid": "N2", "name": "Target"}
+        
+        assert budget.can_add_edge(edge, node) is True
+        expected = budget.edge_cost(edge, node)
+        
+        calls = []
+        original = budget._edge_costs
+        monkeypatch.setattr(budget, "_edge_costs", lambda *a: calls.append(a) or original(*a))
+        budget.add_edge(edge, node)
+        
+        assert calls == []
+        assert budget.used == expected
+        
+        # A different edge is priced normally
+        other = {"id": "E:N1:N3:1", "fact": "g"}
+        budget.add_edge(other)
+        assert len(calls) == 1
+    
+    def test_add_edge_tracks_result_size(self):
+        """Test that incremental edge accounting stays close to a full re-count."""
+        budget = TokenBudget(limit=20000)
+        result = {"start": "N1", "nodes": {"N1": {"uuid": "N1", "name": "Root"}}, "edges": []}
+        budget.set_current_state(result)
+        
+        for i in range(2, 50):
+            node = {"uuid": f"N{i}", "name": f"Node {i}", "summary": "s " * i}
+            edge = {"id": f"E:N1:N{i}:{i}", "from": "N1", "to": f"N{i}", "fact": "f " * i}
+            assert budget.can_add_edge(edge, node) is True
+            budget.add_edge(edge, node)
+            result["nodes"][node["uuid"]] = node
+            result["edges"].append(edge)
+        
+        # Never under-counts the real result
+        assert budget.used >= estimate_tokens(result)
+        assert budget.used <= estimate_tokens(result) * 1.25
+    
+    def test_can_add_edge_cheap_uses_measured_sizes(self):
+        """Test that the cheap pre-check tracks sizes seen by can_add_edge."""
+        budget = TokenBudget(limit=200)
+        result = {"node": {"uuid": "N1"}, "edges": []}
+        edge = {"uuid": "E1", "type": "RELATES_TO", "fact": "x " * 40}
+        
+        assert budget.can_add_edge_cheap() is True
+        
+        # Fill the result until the exact check refuses the next edge
+        budget.set_current_state(result)
+        while budget.can_add_edge(edge):
+            result["edges"].append(edge)
+            budget.add_edge(edge)
+        
+        # The pre-check now accounts for the tokens added so far
+        assert budget.used >= estimate_tokens(result)
+        assert budget.can_add_edge_cheap(edge_tokens=budget.remaining() + 1) is False
+        assert budget.can_add_edge_cheap(edge_tokens=0) is True
+        
+        # The edge estimate moved towards the observed edge size
+        assert budget.edge_estimate != DEFAULT_EDGE_TOKEN_ESTIMATE
+    
+    def test_cheap_check_ignores_node_sizes(self):
+        """Test that the cheap pre-check prices edges without the nodes they brought."""
+        budget = TokenBudget(limit=10_000)
+        edge = {"uuid": "E1", "type": "RELATES_TO"}
+        node = {"uuid": "N2", "summary": "y " * 400}
+        
+        for _ in range(10):
+            assert budget.can_add_edge(edge, node) is True
+            budget.add_edge(edge, node)
+        
+        assert budget.edge_only_estimate < budget.edge_estimate
+        
+        # Room for another edge to a visited node, but not for another new node
+        budget.used = budget.limit - int(budget.edge_only_estimate) - 1
+        assert budget.can_add_edge_cheap() is True
+        assert budget.can_add_edge(edge, node) is False
+    
+    def test_edges_remaining(self):
+        """Test that the remaining edge capacity follows the edge estimate."""
+        budget = TokenBudget(limit=1000)
+        budget.edge_estimate = 100
+        assert budget.edges_remaining() == 10
+        
+        budget.used = 950
+        assert budget.edges_remaining() == 0
+        
+        budget.used = 1200
+        assert budget.edges_remaining() == 0
     
     def test_token_budget_reset(self):
         """Test resetting the budget."""
@@ -14,9 +14,12 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from graphiti_core import Graphiti
-from graphiti_core.nodes import EntityNode
-from graphiti_core.edges import EntityEdge
-from datetime import datetime
+from graphiti_core.nodes import EntityNode, get_entity_node_from_record
+from graphiti_core.edges import EntityEdge, get_entity_edge_from_record
+from datetime import datetime, timezone
+from neo4j.time import DateTime
+
+from src.tools.format_flat import format_edge_flat, format_node_flat
 
 from src.tools.traverse_knowledge_graph import (
     format_node_result,
@@ -24,7 +27,10 @@ from src.tools.traverse_knowledge_graph import (
     get_node_by_uuid,
     traverse_knowledge_graph,
     traverse_knowledge_graph_impl,
-    ErrorResponse
+    ErrorResponse,
+    _node_flat_from_record,
+    _flat_edge_from_record,
+    get_edges_by_node_uuids,
 )
 
 # Test configuration
@@ -338,9 +344,105 @@ class TestTraverseKnowledgeGraphImpl:
         )
         yield client
         await client.driver.close()
+
+
+class TestNodeFlatProjection:
+    """Test that Cypher-projected flat nodes match format_node_flat output."""
     
+    def test_projection_matches_format_node_flat(self):
+        """Test that both flat node paths emit the same dictionary."""
+        def record():
+            # Fresh per path, since both paths consume the attribute map
+            created_at = DateTime.from_native(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+            return {
+                'uuid': 'N1',
+                'name': 'Alice',
+                'summary': 'A person',
+                'labels': ['Entity', 'Person'],
+                'group_id': 'g1',
+                'created_at': created_at,
+                'attributes': {
+                    'uuid': 'N1', 'name': 'Alice', 'summary': 'A person',
+                    'group_id': 'g1', 'created_at': created_at,
+                    'name_embedding': [0.1, 0.2], 'summary_embedding': [0.3],
+                    'labels': ['Person'], 'role': 'engineer',
+                },
+            }
+        
+        projected = _node_flat_from_record(record())
+        formatted = format_node_flat(get_entity_node_from_record(record()))
+        
+        assert projected == formatted
+        assert projected['attributes'] == {'role': 'engineer'}
+        assert projected['created_at'] == '2024-01-02T03:04:05+00:00'
+
 
+def _edge_record(uuid, source, target, name='WORKS_ON', episodes=('ep-1',)):
+    """A row shaped like both EDGES_BY_NODES_QUERY and ENTITY_EDGE_RETURN output."""
+    created_at = DateTime.from_native(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+    valid_at = DateTime.from_native(datetime(2024, 2, 1, tzinfo=timezone.utc))
+    return {
+        'uuid': uuid,
+        'name': name,
+        'fact': f'{source} {name} {target}',
+        'source_node_uuid': source,
+        'target_node_uuid': target,
+        'group_id': 'g1',
+        'episodes': list(episodes) if episodes is not None else None,
+        'created_at': created_at,
+        'expired_at': None,
+        'valid_at': valid_at,
+        'invalid_at': None,
+        'attributes': {},
+    }
+
+
+class TestEdgeBatchFetch:
+    """Test cases for get_edges_by_node_uuids and its FlatEdge records."""
+    
+    def test_flat_edge_matches_entity_edge(self):
+        """Test that a FlatEdge formats exactly like the EntityEdge of the same row."""
+        record = _edge_record('E1', 'N1', 'N2')
+        
+        flat = format_edge_flat(_flat_edge_from_record(record), depth=1, order=0)
+        entity = format_edge_flat(get_entity_edge_from_record(record), depth=1, order=0)
+        
+        assert flat == entity
+        assert flat['created_at'] == '2024-01-02T03:04:05+00:00'
+        assert flat['valid_at'] == '2024-02-01T00:00:00+00:00'
+    
+    def test_flat_edge_defaults_missing_episodes(self):
+        """Test that a null episodes property becomes an empty list."""
+        edge = _flat_edge_from_record(_edge_record('E1', 'N1', 'N2', episodes=None))
+        assert edge.episodes == []
+    
+    @pytest.mark.asyncio
+    async def test_edges_grouped_by_queried_node(self):
+        """Test that edges are keyed by the queried node and edgeless nodes are absent."""
+        client = Mock()
+        client.driver.execute_query = AsyncMock(return_value=([
+            _edge_record('E1', 'N1', 'N2'),
+            _edge_record('E2', 'N1', 'N3'),
+            # The same relationship seen from its other end
+            _edge_record('E1', 'N2', 'N1'),
+        ], None, None))
+        
+        edges = await get_edges_by_node_uuids(client, ['N1', 'N2', 'N4'])
+        
+        assert client.driver.execute_query.call_args.kwargs['uuids'] == ['N1', 'N2', 'N4']
+        assert set(edges) == {'N1', 'N2'}
+        assert [e.uuid for e in edges['N1']] == ['E1', 'E2']
+        assert [(e.source_node_uuid, e.target_node_uuid) for e in edges['N2']] == [('N2', 'N1')]
+    
+    @pytest.mark.asyncio
+    async def test_empty_input_skips_query(self):
+        """Test that no query is made for an empty uuid list."""
+        client = Mock()
+        client.driver.execute_query = AsyncMock()
+        
+        assert await get_edges_by_node_uuids(client, []) == {}
+        client.driver.execute_query.assert_not_called()
 
 if __name__ == "__main__":
     # Run tests with pytest
-    pytest.main([__file__, "-v", "--asyncio-mode=auto"])
\ No newline at end of file
+    pytest.main([__file__, "-v", "--asyncio-mode=auto"])
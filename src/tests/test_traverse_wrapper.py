@@ -9,8 +9,11 @@ from typing import Dict, Any
 
 from src.tools.traverse_wrapper import (
     traverse_knowledge_graph_paginated,
+    _create_session_store,
 )
 from src.tools.session_store import (
+    SessionStore,
+    RedisSessionStore,
     CursorExpired,
     InvalidCursor,
     SessionNotFound,
@@ -24,6 +27,10 @@ class FakeNode:
         self.uuid = uuid
         self.name = name or f"Node {uuid}"
         self.summary = f"Summary of {name or uuid}"
+        self.labels = ["Entity"]
+        self.group_id = "test-group"
+        self.created_at = None
+        self.attributes = {}
 
 
 class FakeEdge:
@@ -109,6 +116,41 @@ class TestTraverseWrapper:
                 **mock_functions
             )
     
+    @pytest.mark.asyncio
+    async def test_depth_zero_skips_session_and_engine(self, mock_graphiti, mock_functions):
+        """Test that depth 0 returns the node without creating a session."""
+        with patch("src.tools.traverse_wrapper.advance_bfs") as mock_advance, \
+             patch("src.tools.traverse_wrapper._session_store") as mock_store:
+            result = await traverse_knowledge_graph_paginated(
+                mock_graphiti,
+                start_node_uuid="N1",
+                depth=0,
+                **mock_functions
+            )
+            
+            mock_advance.assert_not_called()
+            mock_store.save_session.assert_not_called()
+            mock_store.issue_token.assert_not_called()
+        
+        assert result["start"] == "N1"
+        assert result["nodes"]["N1"]["uuid"] == "N1"
+        assert result["edges"] == []
+        assert result["usage"]["estimated_tokens"] > 0
+        assert result["cursor"] == {"has_more": False}
+    
+    @pytest.mark.asyncio
+    async def test_depth_zero_missing_node(self, mock_graphiti, mock_functions):
+        """Test that depth 0 on a missing node reports it like the engine does."""
+        result = await traverse_knowledge_graph_paginated(
+            mock_graphiti,
+            start_node_uuid="missing-1",
+            depth=0,
+            **mock_functions
+        )
+        
+        assert result["nodes"]["missing-1"] == {"uuid": "missing-1", "error": "Node not found"}
+        assert result["cursor"] == {"has_more": False}
+    
     @pytest.mark.asyncio
     async def test_first_page_returns_root_and_cursor(self, mock_graphiti, mock_functions):
         """Test first page returns root node and cursor info."""
@@ -302,5 +344,18 @@ class TestTraverseWrapper:
                     **mock_functions
                 )
     
+    def test_session_store_defaults_to_in_process(self, monkeypatch):
+        """Test that the in-process store is used when no Redis URL is configured."""
+        monkeypatch.delenv("TRAVERSE_SESSION_REDIS_URL", raising=False)
+        assert type(_create_session_store()) is SessionStore
+    
+    def test_session_store_falls_back_without_redis_package(self, monkeypatch):
+        """Test that a configured Redis URL falls back to in-process storage if redis is missing."""
+        monkeypatch.setenv("TRAVERSE_SESSION_REDIS_URL", "redis://localhost:6379/0")
+        monkeypatch.setattr("src.tools.session_store.redis_asyncio", None)
+        store = _create_session_store()
+        assert type(store) is SessionStore
+        assert not isinstance(store, RedisSessionStore)
+    
     # Removed test_extended_function_* tests as traverse_knowledge_graph_extended is deprecated
     # The functionality is now directly handled by traverse_knowledge_graph_impl calling traverse_knowledge_graph_paginated
\ No newline at end of file
@@ -1,11 +1,16 @@
 """Tools module for Graphiti MCP server."""
 
-from .entity_relations import get_entity_relations, format_fact_result
+from .entity_relations import (
+    get_entity_relations,
+    get_entity_relations_paginated,
+    format_fact_result,
+)
 from .traverse_knowledge_graph import traverse_knowledge_graph
 from .graph_functions import find_paths_between_entities, build_subgraph
 
 __all__ = [
     'get_entity_relations', 
+    'get_entity_relations_paginated',
     'format_fact_result', 
     'traverse_knowledge_graph',
     'find_paths_between_entities',
@@ -1,35 +1,73 @@
 """BFS engine for cursor-based graph traversal."""
 
+import asyncio
 import logging
+from itertools import islice
 from typing import Any, Dict, List, Tuple, Optional
 from graphiti_core import Graphiti
 from graphiti_core.edges import EntityEdge
 
 from .session_store import Frame, TraverseSession
-from .token_budget import TokenBudget, estimate_tokens
+from .token_budget import TokenBudget
 from .format_flat import format_node_flat, format_edge_flat
 
 logger = logging.getLogger(__name__)
 
-# Edge ordering functions for stable sorting
+# Number of frontier frames whose edges are fetched together
+EDGE_FETCH_AHEAD = 8
+
+# Maximum number of neighbour nodes fetched per batch query
+NODE_PREFETCH_SIZE = 100
+
+# Edge ordering functions for stable sorting.
+# EntityEdge always defines these fields, so plain attribute access is used
+# instead of getattr() with defaults.
 EDGE_ORDER = {
     "uuid": lambda e: (
-        getattr(e, "name", ""),
-        getattr(e, "target_node_uuid", None) or getattr(e, "source_node_uuid", None)
+        e.name,
+        e.target_node_uuid or e.source_node_uuid
     ),
     "type_then_uuid": lambda e: (
-        getattr(e, "name", ""),
-        getattr(e, "created_at", None),
-        getattr(e, "target_node_uuid", None) or getattr(e, "source_node_uuid", None)
+        e.name,
+        e.created_at,
+        e.target_node_uuid or e.source_node_uuid
     ),
     "created_at_then_uuid": lambda e: (
-        getattr(e, "created_at", None),
-        getattr(e, "name", ""),
-        getattr(e, "target_node_uuid", None) or getattr(e, "source_node_uuid", None)
+        e.created_at,
+        e.name,
+        e.target_node_uuid or e.source_node_uuid
     ),
 }
 
 
+async def fetch_root_node(
+    graphiti_client: Graphiti,
+    node_uuid: str,
+    *,
+    get_node_by_uuid,
+    get_node_flat_by_uuid=None,
+) -> Dict[str, Any]:
+    """Fetch a traversal's start node in flat format.
+    
+    Args:
+        graphiti_client: The Graphiti client instance
+        node_uuid: UUID of the start node
+        get_node_by_uuid: Function to get node by UUID
+        get_node_flat_by_uuid: Optional function returning the node already in flat format
+        
+    Returns:
+        The flat node, or a "Node not found" placeholder if it does not exist
+    """
+    if get_node_flat_by_uuid is not None:
+        node_data = await get_node_flat_by_uuid(graphiti_client, node_uuid)
+    else:
+        node = await get_node_by_uuid(graphiti_client, node_uuid)
+        node_data = None if node is None else format_node_flat(node)
+    if node_data is None:
+        node_data = {"uuid": node_uuid, "error": "Node not found"}
+    return node_data
+
+
 async def advance_bfs(
     sess: TraverseSession,
     graphiti_client: Graphiti,
@@ -37,6 +75,9 @@ async def advance_bfs(
     format_node_result,
     format_edge_for_traverse,
     get_node_by_uuid,
+    get_node_flat_by_uuid=None,
+    get_nodes_flat_by_uuids=None,
+    get_edges_by_node_uuids=None,
     budget: Optional[TokenBudget] = None
 ) -> Tuple[Dict[str, Any], bool, int]:
     """Advance BFS traversal by one page.
@@ -47,6 +88,12 @@ async def advance_bfs(
         format_node_result: Function to format node results (unused, kept for compatibility)
         format_edge_for_traverse: Function to format edge results (unused, kept for compatibility)
         get_node_by_uuid: Function to get node by UUID
+        get_node_flat_by_uuid: Optional function returning a node already in flat
+            format; when given, it replaces get_node_by_uuid + format_node_flat
+        get_nodes_flat_by_uuids: Optional batch variant returning flat nodes keyed
+            by UUID; when given, a frame's unseen neighbours are fetched together
+        get_edges_by_node_uuids: Optional function returning edge lists keyed by
+            node UUID; when given, edges of upcoming frames come from one query
         budget: Optional token budget (defaults to new TokenBudget)
         
     Returns:
@@ -58,6 +105,81 @@ async def advance_bfs(
     if budget is None:
         budget = TokenBudget()
     
+    # Nodes looked up this page that do not exist, so they are not re-queried
+    missing_nodes: set = set()
+    
+    async def fetch_node_flat(node_uuid: str) -> Optional[Dict[str, Any]]:
+        # Nodes fetched for an edge that did not fit are reused on the next page
+        cached = sess.get_cached_node(node_uuid)
+        if cached is not None:
+            return cached
+        if node_uuid in missing_nodes:
+            return None
+        if get_node_flat_by_uuid is not None:
+            node_data = await get_node_flat_by_uuid(graphiti_client, node_uuid)
+        else:
+            node = await get_node_by_uuid(graphiti_client, node_uuid)
+            node_data = None if node is None else format_node_flat(node)
+        if node_data is not None:
+            sess.cache_node(node_uuid, node_data)
+        else:
+            missing_nodes.add(node_uuid)
+        return node_data
+    
+    # Edge lists fetched ahead for frames still waiting in the frontier
+    fetched_edges: Dict[str, List[Any]] = {}
+    
+    async def fetch_edges(node_uuid: str) -> List[Any]:
+        try:
+            return await EntityEdge.get_by_node_uuid(graphiti_client.driver, node_uuid)
+        except Exception as e:
+            logger.error(f"Error getting edges for node {node_uuid}: {str(e)}")
+            return []
+    
+    async def fetch_edges_ahead(uuids: List[str]) -> None:
+        if get_edges_by_node_uuids is not None:
+            try:
+                batch = await get_edges_by_node_uuids(graphiti_client, uuids)
+            except Exception as e:
+                # Fall back to one query per node below
+                logger.warning(f"Batch edge fetch failed, fetching per node: {str(e)}")
+            else:
+                fetched_edges.update((u, batch.get(u, [])) for u in uuids)
+                return
+        results = await asyncio.gather(*(fetch_edges(u) for u in uuids))
+        fetched_edges.update(zip(uuids, results))
+    
+    # Cleared when a batch node query fails, so the rest of the page fetches
+    # nodes one at a time instead of retrying the batch for every edge
+    batch_nodes = get_nodes_flat_by_uuids is not None
+    
+    async def prefetch_nodes(edges_window, frame_uuid: str) -> None:
+        # One query for the next window of unvisited, uncached neighbours
+        # instead of one query per edge
+        nonlocal batch_nodes
+        uuids = []
+        for e in edges_window:
+            other = e.target_node_uuid if e.source_node_uuid == frame_uuid else e.source_node_uuid
+            if other in sess.visited or other in sess.node_cache or other in missing_nodes:
+                continue
+            uuids.append(other)
+        if not uuids:
+            return
+        try:
+            nodes = await get_nodes_flat_by_uuids(graphiti_client, uuids)
+        except Exception as e:
+            # Leave the uuids unmarked; fetch_node_flat looks them up singly
+            logger.warning(f"Batch node fetch failed, fetching per node: {str(e)}")
+            batch_nodes = False
+            return
+        # Only a successful query proves that an absent node does not exist
+        for node_uuid in dict.fromkeys(uuids):
+            node_data = nodes.get(node_uuid)
+            if node_data is not None:
+                sess.cache_node(node_uuid, node_data)
+            else:
+                missing_nodes.add(node_uuid)
+    
     # Initialize result with flat structure
     result: Dict[str, Any] = {
         "start": sess.root_uuid,
@@ -67,56 +189,83 @@ async def advance_bfs(
     
     # First page: add root node to nodes dict
     if not sess.visited:
-        sess.visited = [sess.root_uuid]
-        root = await get_node_by_uuid(graphiti_client, sess.root_uuid)
-        
-        if root is None:
-            result["nodes"][sess.root_uuid] = {"uuid": sess.root_uuid, "error": "Node not found"}
-        else:
-            result["nodes"][sess.root_uuid] = format_node_flat(root)
+        sess.visited = {sess.root_uuid}
+        result["nodes"][sess.root_uuid] = await fetch_root_node(
+            graphiti_client,
+            sess.root_uuid,
+            get_node_by_uuid=get_node_by_uuid,
+            get_node_flat_by_uuid=get_node_flat_by_uuid,
+        )
         
         # Initialize frontier with root if we need to traverse
         if sess.max_depth > 0:
             sess.frontier.append(Frame(sess.root_uuid, sess.max_depth, 0))
-        
-        # Early return if no traversal needed
-        if sess.max_depth == 0:
-            return result, False, estimate_tokens(result)
+    
+    # Budget checks are incremental from here on; measure the page once
+    budget.set_current_state(result)
+    
+    # Ordering is fixed for the session; resolve it once per page
+    key_fn = EDGE_ORDER.get(sess.edge_ordering, EDGE_ORDER["uuid"])
     
     # Process frontier queue
     while sess.frontier:
-        frame = sess.frontier.pop(0)  # Dequeue from front
+        frame = sess.frontier.popleft()  # Dequeue from front
         
-        # Get edges for current node
-        try:
-            edges = await EntityEdge.get_by_node_uuid(graphiti_client.driver, frame.node_uuid)
-        except Exception as e:
-            logger.error(f"Error getting edges for node {frame.node_uuid}: {str(e)}")
-            edges = []
+        # A frame the previous page stopped in resumes with the edges already
+        # fetched and sorted for it, instead of querying them again
+        pending = sess.pending_edges
+        sess.pending_edges = None
+        if pending is not None and pending[0] == frame.node_uuid:
+            edges_sorted = pending[1]
+        else:
+            # Get edges for current node, fetching those of the next frames
+            # in the frontier in the same round since the queries are independent
+            if frame.node_uuid not in fetched_edges:
+                # Look no further ahead than the edges this page can still
+                # take, so a nearly full page does not pull in (possibly huge)
+                # edge lists of frames it will never reach
+                look_ahead = min(EDGE_FETCH_AHEAD, budget.edges_remaining())
+                ahead = [frame.node_uuid]
+                for next_frame in islice(sess.frontier, max(0, look_ahead - 1)):
+                    if next_frame.node_uuid not in fetched_edges:
+                        ahead.append(next_frame.node_uuid)
+                ahead = list(dict.fromkeys(ahead))
+                await fetch_edges_ahead(ahead)
+            edges = fetched_edges.pop(frame.node_uuid)
+            
+            if not edges:
+                continue  # No edges, move to next frame
+            
+            # Sort edges for stable ordering
+            edges_sorted = sorted(edges, key=key_fn)
         
-        if not edges:
-            continue  # No edges, move to next frame
+        # Calculate depth from start (max_depth - depth_remaining + 1)
+        current_depth = sess.max_depth - frame.depth_remaining + 1
         
-        # Sort edges for stable ordering
-        key_fn = EDGE_ORDER.get(sess.edge_ordering, EDGE_ORDER["uuid"])
-        edges_sorted = sorted(edges, key=key_fn)
+        # Edge IDs are "E:{source}:{target}:{order}"; the frame's node is one end
+        outgoing_prefix = f"E:{frame.node_uuid}:"
+        incoming_suffix = f":{frame.node_uuid}:"
         
         # Process edges starting from where we left off
         i = frame.next_edge_index
         while i < len(edges_sorted):
             edge = edges_sorted[i]
             
-            # Determine target node
+            # Cheap pre-check so edges that cannot fit are never formatted.
+            # Skipped until this page holds an edge, so every page makes progress.
+            if result["edges"] and not budget.can_add_edge_cheap():
+                frame.next_edge_index = i
+                sess.frontier.appendleft(frame)  # Put frame back at front
+                sess.pending_edges = (frame.node_uuid, edges_sorted)
+                return result, True, budget.used
+            
+            # Determine target node and generate edge ID
             if edge.source_node_uuid == frame.node_uuid:
                 target_uuid = edge.target_node_uuid
+                edge_id = outgoing_prefix + target_uuid + ":" + str(sess.yielded_edges)
             else:
                 target_uuid = edge.source_node_uuid
-            
-            # Calculate depth from start (max_depth - depth_remaining + 1)
-            current_depth = sess.max_depth - frame.depth_remaining + 1
-            
-            # Generate edge ID
-            edge_id = f"E:{edge.source_node_uuid}:{edge.target_node_uuid}:{sess.yielded_edges}"
+                edge_id = "E:" + target_uuid + incoming_suffix + str(sess.yielded_edges)
             
             # Format edge with metadata
             edge_obj = format_edge_flat(
@@ -128,54 +277,48 @@ async def advance_bfs(
             
             # Add target node to nodes dict if not visited
             if target_uuid not in sess.visited:
-                target_node = await get_node_by_uuid(graphiti_client, target_uuid)
-                if target_node is None:
+                if (
+                    batch_nodes
+                    and target_uuid not in sess.node_cache
+                    and target_uuid not in missing_nodes
+                ):
+                    await prefetch_nodes(edges_sorted[i:i + NODE_PREFETCH_SIZE], frame.node_uuid)
+                node_data = await fetch_node_flat(target_uuid)
+                if node_data is None:
                     # Only add to nodes dict if this edge will be included
-                    temp_nodes = {target_uuid: {"uuid": target_uuid, "error": "Node not found"}}
-                else:
-                    temp_nodes = {target_uuid: format_node_flat(target_node)}
-                
-                # Check if we can add this edge and node within budget
-                temp_result = {
-                    "nodes": {**result["nodes"], **temp_nodes},
-                    "edges": result["edges"] + [edge_obj]
-                }
-                
-                if budget.can_add_edge(result, edge_obj) and estimate_tokens(temp_result) <= budget.limit:
-                    # Add the node and edge
-                    result["nodes"].update(temp_nodes)
-                    result["edges"].append(edge_obj)
-                    sess.yielded_edges += 1
-                    
-                    # Mark as visited and add to frontier if needed
-                    sess.visited.append(target_uuid)
-                    if frame.depth_remaining > 1:
-                        sess.frontier.append(
-                            Frame(target_uuid, frame.depth_remaining - 1, 0)
-                        )
-                    i += 1
-                else:
-                    # Budget exceeded - save position and return
-                    frame.next_edge_index = i
-                    sess.frontier.insert(0, frame)  # Put frame back at front
-                    est = estimate_tokens(result)
-                    return result, True, est
+                    node_data = {"uuid": target_uuid, "error": "Node not found"}
             else:
                 # Target already visited - just add the edge
-                if budget.can_add_edge(result, edge_obj):
-                    result["edges"].append(edge_obj)
-                    sess.yielded_edges += 1
-                    i += 1
-                else:
-                    # Budget exceeded - save position and return
-                    frame.next_edge_index = i
-                    sess.frontier.insert(0, frame)  # Put frame back at front
-                    est = estimate_tokens(result)
-                    return result, True, est
+                node_data = None
+            
+            # Check if we can add this edge (and node) within budget. The first
+            # edge of a page is always admitted, even when it alone is over
+            # budget; otherwise the traversal would never get past it.
+            if result["edges"] and not budget.can_add_edge(edge_obj, node_data):
+                # Budget exceeded - save position and return
+                frame.next_edge_index = i
+                sess.frontier.appendleft(frame)  # Put frame back at front
+                sess.pending_edges = (frame.node_uuid, edges_sorted)
+                return result, True, budget.used
+            
+            budget.add_edge(edge_obj, node_data)
+            result["edges"].append(edge_obj)
+            sess.yielded_edges += 1
+            i += 1
+            
+            if node_data is not None:
+                result["nodes"][target_uuid] = node_data
+                
+                # Mark as visited and add to frontier if needed
+                sess.visited.add(target_uuid)
+                if frame.depth_remaining > 1:
+                    sess.frontier.append(
+                        Frame(target_uuid, frame.depth_remaining - 1, 0)
+                    )
         
         # Finished processing all edges for this frame
         # Frame is discarded (not put back in frontier)
     
     # Frontier is empty - traversal complete
-    est = estimate_tokens(result)
-    return result, False, est
\ No newline at end of file
+    # The budget has tracked the page size all along; no need to serialize it
+    return result, False, budget.used
\ No newline at end of file
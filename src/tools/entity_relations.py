@@ -1,16 +1,42 @@
 """Entity relations functionality for Graphiti MCP server."""
 
+from operator import attrgetter
 from typing import Any, cast, TypedDict
 import logging
 from graphiti_core import Graphiti
-from graphiti_core.edges import EntityEdge
+from graphiti_core.edges import EntityEdge, get_entity_edge_from_record
+from graphiti_core.models.edges.edge_db_queries import ENTITY_EDGE_RETURN
 
 
 class ErrorResponse(TypedDict):
     error: str
 
+
+class RelationsPage(TypedDict):
+    edges: list[dict[str, Any]]
+    next: str | None  # UUID of the last edge, None on the final page
+
 logger = logging.getLogger(__name__)
 
+# Page size used when get_entity_relations walks every page
+RELATIONS_PAGE_SIZE = 500
+
+# Keyset-paginated variant of EntityEdge.get_by_node_uuid
+RELATIONS_PAGE_QUERY = f"""
+MATCH (n:Entity {{uuid: $node_uuid}})-[e:RELATES_TO]-(m:Entity)
+WHERE $after IS NULL OR e.uuid > $after
+RETURN {ENTITY_EDGE_RETURN}
+ORDER BY e.uuid
+LIMIT $limit
+"""
+
+
+# Fields every EntityEdge has, fetched in one C-level call per edge
+_FACT_FIELDS = attrgetter(
+    'uuid', 'name', 'fact', 'created_at', 'valid_at', 'invalid_at',
+    'source_node_uuid', 'target_node_uuid', 'episodes',
+)
+
 
 def format_fact_result(edge: EntityEdge) -> dict[str, Any]:
     """Format an EntityEdge as a fact result.
@@ -21,54 +47,103 @@ def format_fact_result(edge: EntityEdge) -> dict[str, Any]:
     Returns:
         A dictionary containing the formatted fact
     """
+    (
+        uuid, name, fact, created_at, valid_at, invalid_at,
+        source_uuid, target_uuid, episodes,
+    ) = _FACT_FIELDS(edge)
     return {
-        'uuid': edge.uuid,
-        'name': edge.name,
-        'fact': edge.fact,
-        'created_at': edge.created_at.isoformat() if edge.created_at else None,
-        'valid_at': edge.valid_at.isoformat() if edge.valid_at else None,
-        'invalid_at': edge.invalid_at.isoformat() if edge.invalid_at else None,
+        'uuid': uuid,
+        'name': name,
+        'fact': fact,
+        'created_at': created_at.isoformat() if created_at else None,
+        'valid_at': valid_at.isoformat() if valid_at else None,
+        'invalid_at': invalid_at.isoformat() if invalid_at else None,
         'confidence': getattr(edge, 'confidence', None),
-        'source_uuid': edge.source_node_uuid,
-        'target_uuid': edge.target_node_uuid,
-        'episodes': edge.episodes if hasattr(edge, 'episodes') else [],
+        'source_uuid': source_uuid,
+        'target_uuid': target_uuid,
+        'episodes': episodes,
     }
 
 
-async def get_entity_relations(
+async def get_entity_relations_paginated(
     graphiti_client: Graphiti | None,
     entity_uuid: str,
-) -> list[dict[str, Any]] | ErrorResponse:
-    """Get all relationships (edges) connected to a specific entity.
+    limit: int = RELATIONS_PAGE_SIZE,
+    after: str | None = None,
+) -> RelationsPage | ErrorResponse:
+    """Get one page of relationships (edges) connected to a specific entity.
+
+    Edges are ordered by UUID and fetched with a LIMIT on the server, so hub
+    nodes are never materialized in full.
 
     Args:
         graphiti_client: The Graphiti client instance
         entity_uuid: UUID of the entity node to get relationships for
+        limit: Maximum number of edges in the page
+        after: Continuation token (the 'next' value of the previous page)
         
     Returns:
-        A list of formatted edges or an ErrorResponse
+        A RelationsPage with formatted edges and the next token, or an ErrorResponse
     """
     if graphiti_client is None:
         return ErrorResponse(error='Graphiti client not initialized')
 
-    try:
-        # We've already checked that graphiti_client is not None above
-        assert graphiti_client is not None
+    if limit <= 0:
+        return ErrorResponse(error='limit must be a positive integer')
 
-        # Use cast to help the type checker understand that graphiti_client is not None
+    try:
         client = cast(Graphiti, graphiti_client)
 
-        # Get all edges connected to this entity using the EntityEdge class method
-        entity_edges = await EntityEdge.get_by_node_uuid(client.driver, entity_uuid)
+        records, _, _ = await client.driver.execute_query(
+            RELATIONS_PAGE_QUERY,
+            node_uuid=entity_uuid,
+            after=after,
+            limit=limit,
+            routing_='r',
+        )
 
-        if not entity_edges:
-            return []
+        entity_edges = [get_entity_edge_from_record(record) for record in records]
 
-        # Format all edges for response
-        formatted_edges = [format_fact_result(edge) for edge in entity_edges]
-        
-        return formatted_edges
+        # A short page means there is nothing left to fetch
+        next_token = entity_edges[-1].uuid if len(entity_edges) == limit else None
+
+        return RelationsPage(
+            edges=[format_fact_result(edge) for edge in entity_edges],
+            next=next_token,
+        )
     except Exception as e:
         error_msg = str(e)
         logger.error(f'Error getting entity relations: {error_msg}')
-        return ErrorResponse(error=f'Error getting entity relations: {error_msg}')
\ No newline at end of file
+        return ErrorResponse(error=f'Error getting entity relations: {error_msg}')
+
+
+async def get_entity_relations(
+    graphiti_client: Graphiti | None,
+    entity_uuid: str,
+) -> list[dict[str, Any]] | ErrorResponse:
+    """Get all relationships (edges) connected to a specific entity.
+
+    Args:
+        graphiti_client: The Graphiti client instance
+        entity_uuid: UUID of the entity node to get relationships for
+        
+    Returns:
+        A list of formatted edges or an ErrorResponse
+    """
+    if graphiti_client is None:
+        return ErrorResponse(error='Graphiti client not initialized')
+
+    formatted_edges: list[dict[str, Any]] = []
+    after: str | None = None
+
+    while True:
+        page = await get_entity_relations_paginated(
+            graphiti_client, entity_uuid, limit=RELATIONS_PAGE_SIZE, after=after
+        )
+        if 'error' in page:
+            return cast(ErrorResponse, page)
+
+        formatted_edges.extend(page['edges'])
+        after = page['next']
+        if after is None:
+            return formatted_edges
@@ -1,10 +1,32 @@
 """Flat response format for traverse_knowledge_graph."""
 
+from datetime import datetime
+from sys import intern
 from typing import Any, Dict
 from graphiti_core.nodes import EntityNode
 from graphiti_core.edges import EntityEdge
 
 
+def _iso(dt: datetime | None) -> str | None:
+    """Format an optional datetime as ISO 8601."""
+    return dt.isoformat() if dt is not None else None
+
+
+# Node properties that are columns of the flat format (or embeddings) rather
+# than attributes; also applied to the Cypher projection of flat nodes
+_NODE_FLAT_RESERVED = frozenset({
+    'uuid', 'name', 'summary', 'group_id', 'created_at',
+    'name_embedding', 'summary_embedding', 'labels',
+})
+
+
+def _node_flat_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop reserved properties from a node's attributes (copying only if needed)."""
+    if _NODE_FLAT_RESERVED.isdisjoint(attributes):
+        return attributes
+    return {k: v for k, v in attributes.items() if k not in _NODE_FLAT_RESERVED}
+
+
 def format_node_flat(node: EntityNode) -> Dict[str, Any]:
     """Format an EntityNode for flat structure.
     
@@ -17,11 +39,11 @@ def format_node_flat(node: EntityNode) -> Dict[str, Any]:
     return {
         'uuid': node.uuid,
         'name': node.name,
-        'summary': node.summary if hasattr(node, 'summary') else '',
-        'labels': node.labels if hasattr(node, 'labels') else [],
+        'summary': getattr(node, 'summary', ''),
+        'labels': [intern(label) for label in getattr(node, 'labels', ())],
         'group_id': node.group_id,
-        'created_at': node.created_at.isoformat() if node.created_at else None,
-        'attributes': node.attributes if hasattr(node, 'attributes') else {},
+        'created_at': _iso(node.created_at),
+        'attributes': _node_flat_attributes(getattr(node, 'attributes', {})),
     }
 
 
@@ -47,16 +69,18 @@ def format_edge_flat(
         # Use a composite of source and target UUIDs as ID
         edge_id = f"E:{edge.source_node_uuid}:{edge.target_node_uuid}"
     
+    # Edge types and labels come from a small vocabulary; interning them
+    # keeps one copy per distinct value across a page
     return {
         'id': edge_id,
-        'type': edge.name,
+        'type': intern(edge.name),
         'fact': edge.fact,
         'source': edge.source_node_uuid,
         'target': edge.target_node_uuid,
-        'episodes': edge.episodes if hasattr(edge, 'episodes') else [],
-        'created_at': edge.created_at.isoformat() if edge.created_at else None,
-        'valid_at': edge.valid_at.isoformat() if edge.valid_at else None,
-        'invalid_at': edge.invalid_at.isoformat() if edge.invalid_at else None,
+        'episodes': getattr(edge, 'episodes', []),
+        'created_at': _iso(edge.created_at),
+        'valid_at': _iso(edge.valid_at),
+        'invalid_at': _iso(edge.invalid_at),
         'depth': depth,
         'order': order,
     }
\ No newline at end of file
@@ -4,7 +4,9 @@ TDD implementation - starting with stub functions.
 """
 
 from typing import Any, TypedDict, cast
+import asyncio
 import logging
+from operator import itemgetter
 from datetime import datetime
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EntityNode, get_entity_node_from_record
@@ -15,6 +17,46 @@ from graphiti_core.models.edges.edge_db_queries import ENTITY_EDGE_RETURN
 
 logger = logging.getLogger(__name__)
 
+# Records of a driver.execute_query() result. Every graphiti driver returns a
+# (records, summary/header, keys) tuple -- neo4j's EagerResult is a NamedTuple --
+# so no per-call attribute probing is needed.
+_records = itemgetter(0)
+
+# Upper bounds applied to find_paths_between_entities arguments
+MAX_PATH_DEPTH = 8
+MAX_PATHS = 100
+
+# model_dump exclude specs: drop top-level embeddings and embeddings
+# stored within attributes
+_NODE_EXCLUDE = {
+    'name_embedding': True,
+    'summary_embedding': True,
+    'attributes': {'fact_embedding', 'name_embedding', 'summary_embedding'}
+}
+
+_EDGE_EXCLUDE = {
+    'fact_embedding': True,
+    'attributes': {'fact_embedding', 'name_embedding', 'summary_embedding'}
+}
+
+# Map projections equivalent to ENTITY_NODE_RETURN / ENTITY_EDGE_RETURN, for
+# returning node and edge details inline as lists of maps. Embedding
+# properties are nulled in the attribute maps so the vectors never leave the
+# server (model_dump drops the keys afterwards)
+PATH_NODE_PROJECTION = """n {
+    .uuid, .name, .group_id, .created_at, .summary,
+    labels: labels(n),
+    attributes: n {.*, name_embedding: null, summary_embedding: null}
+}"""
+
+PATH_EDGE_PROJECTION = """r {
+    .uuid, .group_id, .name, .fact, .episodes,
+    .created_at, .expired_at, .valid_at, .invalid_at,
+    source_node_uuid: startNode(r).uuid,
+    target_node_uuid: endNode(r).uuid,
+    attributes: r {.*, fact_embedding: null}
+}"""
+
 
 # Type definitions for responses
 class ErrorResponse(TypedDict):
@@ -31,8 +73,8 @@ class PathResult(TypedDict):
 class PathSearchResponse(TypedDict):
     message: str
     paths: list[PathResult]
-    node_details: dict[str, dict[str, Any]]  # UUID -> EntityNode attributes
-    edge_details: dict[str, dict[str, Any]]  # UUID -> EntityEdge attributes
+    node_details: list[dict[str, Any]]  # EntityNode attributes, including uuid
+    edge_details: list[dict[str, Any]]  # EntityEdge attributes, including uuid
     metadata: dict[str, Any]
 
 
@@ -69,8 +111,8 @@ async def find_paths_between_entities(
         graphiti_client: The Graphiti client instance
         from_uuid: UUID of the starting entity
         to_uuid: UUID of the target entity
-        max_depth: Maximum path length to search (default: 5)
-        max_paths: Maximum number of paths to return (default: 10)
+        max_depth: Maximum path length to search (default: 5, capped at 8)
+        max_paths: Maximum number of paths to return (default: 10, capped at 100)
 
     Returns:
         PathSearchResponse with found paths or ErrorResponse if error
@@ -78,111 +120,104 @@ async def find_paths_between_entities(
     if graphiti_client is None:
         return ErrorResponse(error="Graphiti client not initialized")
 
+    if max_depth < 1:
+        return ErrorResponse(error="max_depth must be at least 1")
+    if max_paths < 1:
+        return ErrorResponse(error="max_paths must be at least 1")
+
+    # Bound the work a single call can cause on the server
+    max_depth = min(max_depth, MAX_PATH_DEPTH)
+    max_paths = min(max_paths, MAX_PATHS)
+    metadata = {
+        "from_uuid": from_uuid,
+        "to_uuid": to_uuid,
+        "max_depth": max_depth,
+        "max_paths": max_paths,
+    }
+
+    if from_uuid == to_uuid:
+        # The trivial zero-length path; no query needed
+        return PathSearchResponse(
+            message="Start and end entities are identical",
+            paths=[
+                PathResult(
+                    path_id=1, length=0, node_sequence=[from_uuid], edge_sequence=[]
+                )
+            ],
+            node_details=[],
+            edge_details=[],
+            metadata={**metadata, "total_paths_found": 1},
+        )
+
     try:
-        # Execute Cypher query to find paths between Entity nodes
-        # Note: max_depth must be part of the query string, not a parameter
+        # Execute a single Cypher query that returns the paths together with
+        # the details of every distinct node and edge on them (one round
+        # trip; nodes and edges shared by several paths are sent once).
+        # Note: max_depth must be part of the query string, not a parameter.
+        # Coercing to int keeps the set of query texts (and cached plans) to
+        # one per depth and keeps anything but a number out of the query.
+        # Deduplication uses reduce() since APOC is not available.
         # Only Entity nodes with RELATES_TO edges (exclude Episodic)
+        max_depth = int(max_depth)
         path_query = f"""
         MATCH p = (start:Entity {{uuid: $from_uuid}})-[:RELATES_TO*1..{max_depth}]-(end:Entity {{uuid: $to_uuid}})
         WITH p, length(p) as path_length
         ORDER BY path_length
         LIMIT $max_paths
-        RETURN path_length,
-               [n IN nodes(p) | n.uuid] as node_uuids,
-               [r IN relationships(p) | r.uuid] as edge_uuids
+        WITH collect(p) as paths
+        WITH paths,
+             reduce(acc = [], p IN paths | acc + [n IN nodes(p) WHERE NOT n IN acc]) as path_nodes,
+             reduce(acc = [], p IN paths | acc + [r IN relationships(p) WHERE NOT r IN acc]) as path_rels
+        RETURN [p IN paths | {{
+                   path_length: length(p),
+                   node_uuids: [n IN nodes(p) | n.uuid],
+                   edge_uuids: [r IN relationships(p) | r.uuid]
+               }}] as paths,
+               [n IN path_nodes | {PATH_NODE_PROJECTION}] as node_records,
+               [r IN path_rels | {PATH_EDGE_PROJECTION}] as edge_records
         """
 
         path_result = await graphiti_client.driver.execute_query(
             path_query, from_uuid=from_uuid, to_uuid=to_uuid, max_paths=max_paths
         )
+        
+        # The aggregation yields a single row
+        result_records = _records(path_result)
+        record = result_records[0] if result_records else None
 
-        # Parse path results
         paths = []
-        all_node_uuids = set()
-        all_edge_uuids = set()
-        
-        path_records = path_result.records if hasattr(path_result, "records") else path_result[0]
-        
-        for i, record in enumerate(path_records):
-            node_uuids = record["node_uuids"]
-            edge_uuids = record["edge_uuids"]
-            path_length = record["path_length"]
-            
-            # Collect all unique nodes and edges
-            all_node_uuids.update(node_uuids)
-            all_edge_uuids.update(edge_uuids)
-            
-            # Create path result
-            path_result = PathResult(
-                path_id=i + 1,
-                length=path_length,
-                node_sequence=node_uuids,
-                edge_sequence=edge_uuids,
+        for i, path_record in enumerate(record["paths"] if record else []):
+            paths.append(
+                PathResult(
+                    path_id=i + 1,
+                    length=path_record["path_length"],
+                    node_sequence=path_record["node_uuids"],
+                    edge_sequence=path_record["edge_uuids"],
+                )
             )
-            paths.append(path_result)
         
-        # Fetch node details using the same approach as build_subgraph
-        node_details = {}
-        if all_node_uuids:
-            node_query = f"""
-            MATCH (n:Entity)
-            WHERE n.uuid IN $node_uuids
-            RETURN {ENTITY_NODE_RETURN}
-            """
-            
-            node_result = await graphiti_client.driver.execute_query(
-                node_query, node_uuids=list(all_node_uuids)
-            )
-            node_records = node_result.records if hasattr(node_result, "records") else node_result[0]
-            
-            for record in node_records:
-                try:
-                    entity_node = get_entity_node_from_record(record)
-                    
-                    # Use model_dump with exclude to remove embeddings
-                    exclude_dict = {
-                        'name_embedding': True,
-                        'summary_embedding': True,
-                        'attributes': {'fact_embedding', 'name_embedding', 'summary_embedding'}
-                    }
-                    node_data = entity_node.model_dump(
-                        mode='json',
-                        exclude=exclude_dict
-                    )
-                    node_details[entity_node.uuid] = node_data
-                except Exception as e:
-                    logger.warning(f"Failed to process node: {e}")
+        # Details are emitted as lists (each entry carries its own uuid).
+        # Node details come back as ENTITY_NODE_RETURN-shaped maps
+        node_details = []
+        for node_record in record["node_records"] if record else []:
+            try:
+                entity_node = get_entity_node_from_record(node_record)
+                node_details.append(
+                    entity_node.model_dump(mode='json', exclude=_NODE_EXCLUDE)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to process node: {e}")
         
-        # Fetch edge details using the same approach as build_subgraph
-        edge_details = {}
-        if all_edge_uuids:
-            edge_query = f"""
-            MATCH (n)-[e:RELATES_TO]-(m)
-            WHERE e.uuid IN $edge_uuids
-            RETURN {ENTITY_EDGE_RETURN}
-            """
-            
-            edge_result = await graphiti_client.driver.execute_query(
-                edge_query, edge_uuids=list(all_edge_uuids)
-            )
-            edge_records = edge_result.records if hasattr(edge_result, "records") else edge_result[0]
-            
-            for record in edge_records:
-                try:
-                    entity_edge = get_entity_edge_from_record(record)
-                    
-                    # Use model_dump with exclude to remove embeddings
-                    exclude_dict = {
-                        'fact_embedding': True,
-                        'attributes': {'fact_embedding', 'name_embedding', 'summary_embedding'}
-                    }
-                    edge_data = entity_edge.model_dump(
-                        mode='json',
-                        exclude=exclude_dict
-                    )
-                    edge_details[entity_edge.uuid] = edge_data
-                except Exception as e:
-                    logger.warning(f"Failed to process edge: {e}")
+        # Edge details come back as ENTITY_EDGE_RETURN-shaped maps
+        edge_details = []
+        for edge_record in record["edge_records"] if record else []:
+            try:
+                entity_edge = get_entity_edge_from_record(edge_record)
+                edge_details.append(
+                    entity_edge.model_dump(mode='json', exclude=_EDGE_EXCLUDE)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to process edge: {e}")
 
         # Prepare response
         if not paths:
@@ -195,13 +230,7 @@ async def find_paths_between_entities(
             paths=paths,
             node_details=node_details,
             edge_details=edge_details,
-            metadata={
-                "from_uuid": from_uuid,
-                "to_uuid": to_uuid,
-                "max_depth": max_depth,
-                "max_paths": max_paths,
-                "total_paths_found": len(paths),
-            },
+            metadata={**metadata, "total_paths_found": len(paths)},
         )
 
     except Exception as e:
@@ -242,7 +271,9 @@ async def build_subgraph(
         )
 
     try:
-        # Query to get subgraph with specified max_hop distance
+        # Query to get subgraph with specified max_hop distance; like max_depth
+        # in find_paths_between_entities, it is inlined as an int literal
+        max_hop = int(max_hop)
         if max_hop == 0:
             # Get Entity nodes only (exclude Episodic nodes)
             entity_query = f"""
@@ -268,35 +299,41 @@ async def build_subgraph(
             RETURN {ENTITY_NODE_RETURN}
             """
             
-            # Get edges in the expanded neighborhood (Entity-Entity only)
+            # Get edges in the expanded neighborhood (Entity-Entity only).
+            # Endpoints come from startNode/endNode rather than re-matching
+            # each relationship, which fanned out every row
             edge_query = f"""
             UNWIND $entity_uuids AS start_uuid
             MATCH (start:Entity {{uuid: start_uuid}})
-            OPTIONAL MATCH path = (start)-[*0..{max_hop}]-(connected:Entity)
-            WITH relationships(path) as rels
-            UNWIND rels as e
-            MATCH (n:Entity)-[e:RELATES_TO]-(m:Entity)
-            WITH DISTINCT e, n, m
-            WHERE e IS NOT NULL
+            MATCH path = (start)-[*1..{max_hop}]-(connected:Entity)
+            UNWIND relationships(path) as e
+            WITH DISTINCT e
+            WHERE type(e) = 'RELATES_TO'
+            WITH e, startNode(e) AS n, endNode(e) AS m
             RETURN {ENTITY_EDGE_RETURN}
             """
 
-        # Execute queries for Entity nodes and edges only
-        entity_result = await graphiti_client.driver.execute_query(
-            entity_query, entity_uuids=entity_uuids
-        )
-        edge_result = await graphiti_client.driver.execute_query(
-            edge_query, entity_uuids=entity_uuids
+        # Execute queries for Entity nodes and edges only; the two queries are
+        # independent, so run them concurrently on the driver's connection pool
+        entity_result, edge_result = await asyncio.gather(
+            graphiti_client.driver.execute_query(
+                entity_query, entity_uuids=entity_uuids
+            ),
+            graphiti_client.driver.execute_query(
+                edge_query, entity_uuids=entity_uuids
+            ),
         )
 
         # Parse results
-        entity_records = entity_result.records if hasattr(entity_result, "records") else entity_result[0]
-        edge_records = edge_result.records if hasattr(edge_result, "records") else edge_result[0]
+        entity_records = _records(entity_result)
+        edge_records = _records(edge_result)
 
         nodes_dict = {}
-        edges_list = []
-        adjacency_list = {}
-        edge_uuids_seen = set()
+        # Insertion-ordered dedup: edges keep the order Neo4j returned them in
+        edges_by_uuid: dict[str, dict[str, Any]] = {}
+        # Neighbours per node as insertion-ordered sets (dict keys), so
+        # membership checks are O(1) and the emitted order is deterministic
+        adjacency: dict[str, dict[str, None]] = {}
 
         # Process Entity nodes using Graphiti core functions
         if entity_records:
@@ -305,19 +342,13 @@ async def build_subgraph(
                     node = get_entity_node_from_record(record)
                     
                     # Convert to dict with JSON mode (auto-converts datetime to string) and exclude embeddings
-                    # Exclude both top-level embeddings and embeddings within attributes
-                    exclude_dict = {
-                        'name_embedding': True,
-                        'summary_embedding': True,
-                        'attributes': {'fact_embedding', 'name_embedding', 'summary_embedding'}
-                    }
                     node_data = node.model_dump(
                         mode='json',
-                        exclude=exclude_dict
+                        exclude=_NODE_EXCLUDE
                     )
                     
                     nodes_dict[node.uuid] = node_data
-                    adjacency_list[node.uuid] = []
+                    adjacency[node.uuid] = {}
                 except Exception as e:
                     logger.warning(f"Failed to process entity node record: {e}")
         
@@ -326,59 +357,85 @@ async def build_subgraph(
         # Process edges using Graphiti core functions
         if edge_records:
             for record in edge_records:
+                # Track unique edges (skip duplicates before parsing them)
+                if record["uuid"] in edges_by_uuid:
+                    continue
                 try:
                     edge = get_entity_edge_from_record(record)
                     
-                    # Track unique edges
-                    if edge.uuid not in edge_uuids_seen:
-                        edge_uuids_seen.add(edge.uuid)
-                        
-                        # Convert to dict with JSON mode and exclude embeddings
-                        # Exclude both top-level embeddings and embeddings within attributes
-                        exclude_dict = {
-                            'fact_embedding': True,
-                            'attributes': {'fact_embedding', 'name_embedding', 'summary_embedding'}
-                        }
-                        edge_data = edge.model_dump(
-                            mode='json',
-                            exclude=exclude_dict
-                        )
-                        
-                        edges_list.append(edge_data)
-                        
-                        # Update adjacency list
-                        source_uuid = edge.source_node_uuid
-                        target_uuid = edge.target_node_uuid
-                        
-                        if source_uuid in adjacency_list and target_uuid not in adjacency_list[source_uuid]:
-                            adjacency_list[source_uuid].append(target_uuid)
-                        if target_uuid in adjacency_list and source_uuid not in adjacency_list[target_uuid]:
-                            adjacency_list[target_uuid].append(source_uuid)
+                    # Convert to dict with JSON mode and exclude embeddings
+                    edges_by_uuid[edge.uuid] = edge.model_dump(
+                        mode='json',
+                        exclude=_EDGE_EXCLUDE
+                    )
+                    
+                    # Update adjacency list
+                    source_uuid = edge.source_node_uuid
+                    target_uuid = edge.target_node_uuid
+                    
+                    if source_uuid in adjacency:
+                        adjacency[source_uuid][target_uuid] = None
+                    if target_uuid in adjacency:
+                        adjacency[target_uuid][source_uuid] = None
                 except Exception as e:
                     logger.warning(f"Failed to process edge record: {e}")
 
+        edges_list = list(edges_by_uuid.values())
+        adjacency_list = {uuid: list(neighbours) for uuid, neighbours in adjacency.items()}
+
         # Build paths between entities if requested
         paths_between_entities = {}
         if include_paths and len(entity_uuids) > 1:
-            # Calculate paths between each pair of specified entities
-            for i, uuid1 in enumerate(entity_uuids):
-                for uuid2 in entity_uuids[i + 1 :]:
-                    if uuid1 in nodes_dict and uuid2 in nodes_dict:
-                        # Use our find_paths function with limited depth
-                        path_result = await find_paths_between_entities(
-                            graphiti_client,
-                            uuid1,
-                            uuid2,
-                            # Limit depth for performance
-                            max_depth=min(3, max_hop * 2),
-                            max_paths=5,
+            # Calculate paths between each pair of specified entities in a
+            # single batched query rather than one find_paths call per pair
+            # Repeated input uuids would only produce duplicate (or self) pairs
+            unique_uuids = list(dict.fromkeys(entity_uuids))
+            pairs = [
+                {"source": uuid1, "target": uuid2}
+                for i, uuid1 in enumerate(unique_uuids)
+                for uuid2 in unique_uuids[i + 1 :]
+                if uuid1 in nodes_dict and uuid2 in nodes_dict
+            ]
+            if pairs:
+                # Limit depth for performance
+                path_depth = min(3, max_hop * 2)
+                pairs_query = f"""
+                UNWIND $pairs AS pair
+                CALL {{
+                    WITH pair
+                    MATCH p = (start:Entity {{uuid: pair.source}})-[:RELATES_TO*1..{path_depth}]-(end:Entity {{uuid: pair.target}})
+                    WITH p, length(p) as path_length
+                    ORDER BY path_length
+                    LIMIT $max_paths
+                    RETURN collect({{
+                        path_length: path_length,
+                        node_uuids: [n IN nodes(p) | n.uuid],
+                        edge_uuids: [r IN relationships(p) | r.uuid]
+                    }}) as paths
+                }}
+                RETURN pair.source as source, pair.target as target, paths
+                """
+                try:
+                    pairs_result = await graphiti_client.driver.execute_query(
+                        pairs_query, pairs=pairs, max_paths=5
+                    )
+                    pair_records = _records(pairs_result)
+                except Exception as e:
+                    # Paths are supplementary; keep the subgraph if they fail
+                    logger.warning(f"Failed to find paths between entities: {e}")
+                    pair_records = []
+
+                for record in pair_records:
+                    key = f"{record['source']}_to_{record['target']}"
+                    paths_between_entities[key] = [
+                        PathResult(
+                            path_id=i + 1,
+                            length=path_record["path_length"],
+                            node_sequence=path_record["node_uuids"],
+                            edge_sequence=path_record["edge_uuids"],
                         )
-                        if (
-                            not isinstance(path_result, dict)
-                            or "error" not in path_result
-                        ):
-                            key = f"{uuid1}_to_{uuid2}"
-                            paths_between_entities[key] = path_result.get("paths", [])
+                        for i, path_record in enumerate(record["paths"])
+                    ]
 
         # Prepare response
         return SubgraphResponse(
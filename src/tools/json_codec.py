@@ -0,0 +1,30 @@
+"""JSON encoding for size estimation and cursor payloads, using orjson when installed."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize an object to compact UTF-8 encoded JSON."""
+        return orjson.dumps(obj, option=_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a compact JSON string."""
+        return orjson.dumps(obj, option=_OPTIONS).decode("utf-8")
+
+    loads = orjson.loads
+
+except ImportError:
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a compact JSON string."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize an object to compact UTF-8 encoded JSON."""
+        return dumps(obj).encode("utf-8")
+
+    loads = json.loads
@@ -2,13 +2,35 @@
 
 import time
 import json
+import logging
 import hashlib
 import hmac
 import base64
-from typing import Dict, Any, Optional, List
+import heapq
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Any, Optional, List, Set, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timedelta
 
+from .json_codec import dumps_bytes, loads
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Optional dependency, only needed for RedisSessionStore
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of formatted nodes cached per traversal session
+NODE_CACHE_MAXSIZE = 4096
+
+# Largest visited set RedisSessionStore will load; each load reads it in full
+REDIS_MAX_VISITED = 100_000
+
+# Cursor token format: 1 = HMAC-SHA256 signature, 2 = keyed BLAKE2b signature
+TOKEN_VERSION = 2
+
 
 # Exceptions
 class CursorExpired(Exception):
@@ -64,8 +86,8 @@ class TraverseSession:
     snapshot_as_of: Optional[str] = None
     
     # Mutable traversal state
-    frontier: List[Frame] = field(default_factory=list)
-    visited: List[str] = field(default_factory=list)
+    frontier: Deque[Frame] = field(default_factory=deque)
+    visited: Set[str] = field(default_factory=set)
     yielded_edges: int = 0
     
     # Session metadata
@@ -73,9 +95,52 @@ class TraverseSession:
     expires_at: float = 0
     schema_version: int = 1
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return {
+    # In-process cache of formatted nodes (not serialized)
+    node_cache: "OrderedDict[str, Dict[str, Any]]" = field(
+        default_factory=OrderedDict, repr=False, compare=False
+    )
+    
+    # Sorted edges of the frame a page stopped in, reused when it resumes
+    # (not serialized)
+    pending_edges: Optional[Tuple[str, List[Any]]] = field(
+        default=None, repr=False, compare=False
+    )
+    
+    # Visited uuids already written by RedisSessionStore (not serialized)
+    persisted_visited: Set[str] = field(
+        default_factory=set, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        # Accept any iterable of uuids; membership checks need a set
+        if not isinstance(self.visited, set):
+            self.visited = set(self.visited)
+        # The BFS queue pops from the front; a deque keeps that O(1)
+        if not isinstance(self.frontier, deque):
+            self.frontier = deque(self.frontier)
+    
+    def get_cached_node(self, node_uuid: str) -> Optional[Dict[str, Any]]:
+        """Return a previously formatted node, marking it most recently used."""
+        node = self.node_cache.get(node_uuid)
+        if node is not None:
+            self.node_cache.move_to_end(node_uuid)
+        return node
+    
+    def cache_node(self, node_uuid: str, node: Dict[str, Any]) -> None:
+        """Cache a formatted node, evicting the least recently used entry."""
+        self.node_cache[node_uuid] = node
+        self.node_cache.move_to_end(node_uuid)
+        if len(self.node_cache) > NODE_CACHE_MAXSIZE:
+            self.node_cache.popitem(last=False)
+    
+    def to_dict(self, include_visited: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary for serialization.
+        
+        Args:
+            include_visited: Whether to include the visited uuids, for stores
+                that persist them separately
+        """
+        data = {
             "root_uuid": self.root_uuid,
             "max_depth": self.max_depth,
             "strategy": self.strategy,
@@ -83,17 +148,19 @@ class TraverseSession:
             "query_hash": self.query_hash,
             "snapshot_as_of": self.snapshot_as_of,
             "frontier": [f.to_dict() for f in self.frontier],
-            "visited": self.visited,
             "yielded_edges": self.yielded_edges,
             "started_at": self.started_at,
             "expires_at": self.expires_at,
             "schema_version": self.schema_version,
         }
+        if include_visited:
+            data["visited"] = sorted(self.visited)
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TraverseSession":
         """Create TraverseSession from dictionary."""
-        frontier = [Frame.from_dict(f) for f in data.get("frontier", [])]
+        frontier = deque(Frame.from_dict(f) for f in data.get("frontier", []))
         return cls(
             root_uuid=data["root_uuid"],
             max_depth=data["max_depth"],
@@ -102,7 +169,7 @@ class TraverseSession:
             query_hash=data.get("query_hash", ""),
             snapshot_as_of=data.get("snapshot_as_of"),
             frontier=frontier,
-            visited=data.get("visited", []),
+            visited=set(data.get("visited", [])),
             yielded_edges=data.get("yielded_edges", 0),
             started_at=data.get("started_at", time.time()),
             expires_at=data.get("expires_at", 0),
@@ -110,6 +177,23 @@ class TraverseSession:
         )
 
 
+def _b64encode(data: bytes) -> str:
+    """URL-safe base64 without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    """Decode unpadded URL-safe base64, restoring only the padding needed."""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _is_expired(session: TraverseSession, now: Optional[float] = None) -> bool:
+    """Whether a session's expiry has passed; expires_at <= 0 means no expiry."""
+    if session.expires_at <= 0:
+        return False
+    return session.expires_at <= (time.time() if now is None else now)
+
+
 class SessionStore:
     """In-memory session storage with token management."""
     
@@ -119,14 +203,35 @@ class SessionStore:
     def __init__(self):
         """Initialize the session store."""
         self._sessions: Dict[str, TraverseSession] = {}
+        # (expires_at, session_id) min-heap used to sweep abandoned sessions
+        self._expiry_heap: List[Tuple[float, str]] = []
+    
+    def _sign(self, payload_b64: str, version: int = TOKEN_VERSION) -> bytes:
+        """Sign an encoded payload using the scheme of the given token version."""
+        data = payload_b64.encode("utf-8")
+        if version == 1:
+            return hmac.new(self.SECRET_KEY, data, hashlib.sha256).digest()
+        # Keyed BLAKE2b is a single hash pass (key is limited to 64 bytes)
+        return hashlib.blake2b(data, key=self.SECRET_KEY[:64], digest_size=32).digest()
     
     async def save_session(self, session_id: str, session: TraverseSession) -> None:
-        """Save a session to storage."""
+        """Save a session to storage.
+        
+        Sessions are held by reference and never serialized, so saving after
+        each page is O(1) regardless of how large visited/frontier have grown.
+        """
+        if session_id not in self._sessions and session.expires_at > 0:
+            heapq.heappush(self._expiry_heap, (session.expires_at, session_id))
         self._sessions[session_id] = session
+        self._sweep_expired()
     
     async def load_session(self, session_id: str) -> Optional[TraverseSession]:
-        """Load a session from storage."""
-        return self._sessions.get(session_id)
+        """Load a session from storage, dropping it if it has expired."""
+        session = self._sessions.get(session_id)
+        if session is not None and _is_expired(session):
+            self._sessions.pop(session_id, None)
+            return None
+        return session
     
     async def delete_session(self, session_id: str) -> None:
         """Delete a session from storage."""
@@ -135,6 +240,17 @@ class SessionStore:
     async def clear_all(self) -> None:
         """Clear all sessions (for testing)."""
         self._sessions.clear()
+        self._expiry_heap.clear()
+    
+    def _sweep_expired(self) -> None:
+        """Evict sessions whose expiry has passed (abandoned traversals)."""
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, session_id = heapq.heappop(heap)
+            session = self._sessions.get(session_id)
+            if session is not None and _is_expired(session, now):
+                del self._sessions[session_id]
     
     async def issue_token(
         self,
@@ -152,20 +268,16 @@ class SessionStore:
             "qh": query_hash,
             "iat": int(now),
             "exp": int(exp),
+            "v": TOKEN_VERSION,
         }
         
         # Encode as JSON
-        payload_json = json.dumps(payload, separators=(",", ":"))
-        payload_bytes = payload_json.encode("utf-8")
-        payload_b64 = base64.urlsafe_b64encode(payload_bytes).decode("ascii").rstrip("=")
+        payload_bytes = dumps_bytes(payload)
+        payload_b64 = _b64encode(payload_bytes)
         
         # Create signature
-        signature = hmac.new(
-            self.SECRET_KEY,
-            payload_b64.encode("utf-8"),
-            hashlib.sha256
-        ).digest()
-        signature_b64 = base64.urlsafe_b64encode(signature).decode("ascii").rstrip("=")
+        signature = self._sign(payload_b64)
+        signature_b64 = _b64encode(signature)
         
         # Combine into token
         token = f"{payload_b64}.{signature_b64}"
@@ -184,25 +296,19 @@ class SessionStore:
                 raise InvalidCursor("Malformed token")
             
             payload_b64, signature_b64 = parts
+            provided_signature = _b64decode(signature_b64)
             
-            # Verify signature
-            expected_signature = hmac.new(
-                self.SECRET_KEY,
-                payload_b64.encode("utf-8"),
-                hashlib.sha256
-            ).digest()
-            
-            # Decode provided signature (add padding if needed)
-            signature_b64_padded = signature_b64 + "=" * (4 - len(signature_b64) % 4)
-            provided_signature = base64.urlsafe_b64decode(signature_b64_padded)
-            
-            if not hmac.compare_digest(expected_signature, provided_signature):
+            # Verify the signature over the encoded payload before decoding
+            # any of it; tokens without a version predate versioning
+            for version in (TOKEN_VERSION, 1):
+                if hmac.compare_digest(self._sign(payload_b64, version), provided_signature):
+                    break
+            else:
                 raise InvalidCursor("Invalid signature")
             
-            # Decode payload (add padding if needed)
-            payload_b64_padded = payload_b64 + "=" * (4 - len(payload_b64) % 4)
-            payload_bytes = base64.urlsafe_b64decode(payload_b64_padded)
-            payload = json.loads(payload_bytes.decode("utf-8"))
+            payload = loads(_b64decode(payload_b64))
+            if payload.get("v", 1) != version:
+                raise InvalidCursor("Token version does not match its signature")
             
             # Check expiration
             if "exp" in payload and payload["exp"] < time.time():
@@ -215,4 +321,116 @@ class SessionStore:
         except CursorExpired:
             raise
         except Exception as e:
-            raise InvalidCursor(f"Token verification failed: {e}")
\ No newline at end of file
+            raise InvalidCursor(f"Token verification failed: {e}")
+
+
+class RedisSessionStore(SessionStore):
+    """Session storage in Redis, so cursors work across MCP server processes.
+    
+    Each session uses two keys with a Redis expiry matching its expires_at:
+    ``{prefix}{session_id}`` holds the JSON state without visited, and
+    ``{prefix}{session_id}:visited`` is a Redis set of visited uuids. Visited
+    only grows, so each save adds just the uuids visited since the last one;
+    the frontier and scalar state are rewritten, so a save costs O(frontier)
+    rather than the in-process store's O(1). A load reads the whole visited
+    set and costs O(visited); sessions whose visited set has grown past
+    ``max_visited`` are dropped instead of loaded.
+    
+    The in-process node_cache and pending_edges of a session are not
+    persisted. A resumed page therefore re-queries the edges of the frame the
+    previous page stopped in, and any nodes it had already fetched.
+    
+    Requires the ``redis`` package.
+    """
+    
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        url: Optional[str] = None,
+        prefix: str = "graphiti:traverse:",
+        max_visited: int = REDIS_MAX_VISITED,
+    ):
+        """Initialize the store.
+        
+        Args:
+            client: An existing redis.asyncio client
+            url: Redis URL used to create a client when none is given
+            prefix: Key prefix for session entries
+            max_visited: Largest visited set a session may have and still load
+        """
+        super().__init__()
+        if client is None:
+            if redis_asyncio is None:
+                raise ImportError("The redis package is required for RedisSessionStore")
+            client = redis_asyncio.from_url(url or "redis://localhost:6379/0")
+        self._redis = client
+        self._prefix = prefix
+        self._max_visited = max_visited
+    
+    def _keys(self, session_id: str) -> Tuple[str, str]:
+        """Keys of a session's state and of its visited set."""
+        key = self._prefix + session_id
+        return key, key + ":visited"
+    
+    async def save_session(self, session_id: str, session: TraverseSession) -> None:
+        """Save a session to Redis with a TTL derived from its expiry.
+        
+        Only uuids visited since the session was last saved or loaded are
+        sent; the rest of the state is small and rewritten in full.
+        """
+        key, visited_key = self._keys(session_id)
+        ttl = None
+        if session.expires_at > 0:
+            ttl = max(1, int(session.expires_at - time.time()))
+        new_visited = session.visited - session.persisted_visited
+        
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, dumps_bytes(session.to_dict(include_visited=False)), ex=ttl)
+            if new_visited:
+                pipe.sadd(visited_key, *new_visited)
+            if ttl is not None:
+                pipe.expire(visited_key, ttl)
+            else:
+                pipe.persist(visited_key)
+            await pipe.execute()
+        session.persisted_visited |= new_visited
+    
+    async def load_session(self, session_id: str) -> Optional[TraverseSession]:
+        """Load a session from Redis.
+        
+        Reads the whole visited set, so a load costs O(visited). Sessions
+        with more than max_visited visited uuids are deleted and treated as
+        missing rather than read.
+        """
+        key, visited_key = self._keys(session_id)
+        data = await self._redis.get(key)
+        if data is None:
+            return None
+        size = await self._redis.scard(visited_key)
+        if size > self._max_visited:
+            logger.warning(
+                f"Dropping traversal session {session_id}: "
+                f"{size} visited nodes exceed the limit of {self._max_visited}"
+            )
+            await self.delete_session(session_id)
+            return None
+        state = loads(data)
+        persisted = {
+            m.decode("utf-8") if isinstance(m, bytes) else m
+            for m in await self._redis.smembers(visited_key)
+        }
+        # Sessions saved before visited moved to its own key carry it inline
+        state["visited"] = persisted.union(state.get("visited", ()))
+        session = TraverseSession.from_dict(state)
+        session.persisted_visited = persisted
+        return session
+    
+    async def delete_session(self, session_id: str) -> None:
+        """Delete a session from Redis."""
+        await self._redis.delete(*self._keys(session_id))
+    
+    async def clear_all(self) -> None:
+        """Clear all sessions under this store's prefix (for testing)."""
+        async for key in self._redis.scan_iter(match=self._prefix + "*"):
+            await self._redis.delete(key)
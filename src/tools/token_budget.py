@@ -1,24 +1,57 @@
 """Token budget management for response size control."""
 
-import json
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .json_codec import dumps
 
 # Maximum tokens for response (80% of MCP's 25,000 limit for safety)
 MAX_RESPONSE_TOKENS = 20_000
 
+# Initial guess of tokens per flat edge, refined from edges actually measured
+DEFAULT_EDGE_TOKEN_ESTIMATE = 40
+
+# Weight of the newest observation in the edge size moving average
+EDGE_ESTIMATE_SMOOTHING = 0.2
+
+# Tokens for the JSON punctuation around each appended item (", " / ": ")
+SEPARATOR_TOKENS = 2
+
+# Strings up to this length have their token counts memoized
+ENCODE_CACHE_MAX_LEN = 256
+ENCODE_CACHE_SIZE = 8192
+
+# Longer strings are split into chunks of this many characters for batch encoding
+ENCODE_CHUNK_LEN = 4096
+
 # Try to use tiktoken for accurate token counting
 try:
     import tiktoken
     _ENCODER = tiktoken.get_encoding("cl100k_base")
     
+    @lru_cache(maxsize=ENCODE_CACHE_SIZE)
+    def _encoded_len(text: str) -> int:
+        """Token count of a short string; uuids and field values repeat a lot."""
+        return len(_ENCODER.encode_ordinary(text))
+    
+    def _count(text: str) -> int:
+        if len(text) <= ENCODE_CACHE_MAX_LEN:
+            return _encoded_len(text)
+        # Long strings are rarely repeated; encode them in one batch call
+        chunks = [
+            text[i:i + ENCODE_CHUNK_LEN]
+            for i in range(0, len(text), ENCODE_CHUNK_LEN)
+        ]
+        return sum(map(len, _ENCODER.encode_ordinary_batch(chunks)))
+    
     def estimate_tokens(obj: Any) -> int:
         """Estimate token count using tiktoken."""
         if isinstance(obj, str):
-            return len(_ENCODER.encode(obj))
+            return _count(obj)
         else:
             # Convert to JSON string and count
-            json_str = json.dumps(obj, ensure_ascii=False)
-            return len(_ENCODER.encode(json_str))
+            json_str = dumps(obj)
+            return _count(json_str)
             
 except ImportError:
     # Fallback: rough estimation (4 characters ≈ 1 token)
@@ -27,7 +60,7 @@ except ImportError:
         if isinstance(obj, str):
             return max(1, len(obj) // 4)
         else:
-            json_str = json.dumps(obj, ensure_ascii=False)
+            json_str = dumps(obj)
             return max(1, len(json_str) // 4)
 
 
@@ -44,6 +77,12 @@ class TokenBudget:
         self.max_tokens = limit  # Alias for compatibility with spec
         self.used = 0
         self._current_state: Any = None
+        # Average tokens per added edge, including the new node it brought in
+        self.edge_estimate: float = DEFAULT_EDGE_TOKEN_ESTIMATE
+        # Average tokens of the edge alone, for edges to already visited nodes
+        self.edge_only_estimate: float = DEFAULT_EDGE_TOKEN_ESTIMATE
+        # (edge, node, edge tokens, total tokens) priced by the last can_add_edge call
+        self._last_edge_cost: Optional[Tuple[Any, Any, int, int]] = None
     
     def can_add(self, obj: Any) -> bool:
         """Check if object can be added without exceeding budget.
@@ -89,26 +128,86 @@ class TokenBudget:
         self._current_state = state
         self.used = estimate_tokens(state)
     
-    def can_add_edge(self, result: Dict[str, Any], edge: Dict[str, Any]) -> bool:
+    def edge_cost(self, edge: Dict[str, Any], node: Optional[Dict[str, Any]] = None) -> int:
+        """Estimate the tokens an edge (and optionally its new node) adds to a result.
+        
+        Args:
+            edge: Edge object to be appended to the result's edges list
+            node: Node object to be added to the result's nodes dict, if any
+            
+        Returns:
+            Estimated number of tokens, including JSON separators
+        """
+        return self._edge_costs(edge, node)[1]
+    
+    def _edge_costs(self, edge: Dict[str, Any], node: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+        """Return the tokens of the edge alone and of the edge plus its node."""
+        edge_tokens = estimate_tokens(edge) + SEPARATOR_TOKENS
+        tokens = edge_tokens
+        if node is not None:
+            # The node is stored under its uuid key
+            tokens += estimate_tokens(node) + estimate_tokens(node.get("uuid", "")) + SEPARATOR_TOKENS
+        return edge_tokens, tokens
+    
+    def can_add_edge(self, edge: Dict[str, Any], node: Optional[Dict[str, Any]] = None) -> bool:
         """Check if an edge can be added to the result without exceeding budget.
         
-        This is optimized for graph traversal where we're adding edges to a result.
+        Only the new edge (and node) is measured; the size of the result so far
+        is tracked in ``used`` by set_current_state() and add_edge(). The cost
+        is remembered so a following add_edge() for the same objects does not
+        serialize them again.
         
         Args:
-            result: Current result object with edges list
             edge: Edge object to potentially add
+            node: Node object added together with the edge, if any
             
         Returns:
             True if edge can be added, False otherwise
         """
-        # Estimate current size
-        current_tokens = estimate_tokens(result)
+        edge_tokens, tokens = self._edge_costs(edge, node)
+        self._last_edge_cost = (edge, node, edge_tokens, tokens)
+        return (self.used + tokens) <= self.limit
+    
+    def add_edge(self, edge: Dict[str, Any], node: Optional[Dict[str, Any]] = None) -> None:
+        """Account for an edge (and node) that was added to the result.
         
-        # Estimate size with new edge
-        # We'll temporarily add the edge to check
-        result_copy = json.loads(json.dumps(result))  # Deep copy
-        result_copy["edges"].append(edge)
-        new_tokens = estimate_tokens(result_copy)
+        Args:
+            edge: Edge object that was added
+            node: Node object added together with the edge, if any
+        """
+        last = self._last_edge_cost
+        if last is not None and last[0] is edge and last[1] is node:
+            edge_tokens, tokens = last[2], last[3]
+        else:
+            edge_tokens, tokens = self._edge_costs(edge, node)
+        self._last_edge_cost = None
+        self.used += tokens
+        self.edge_estimate += EDGE_ESTIMATE_SMOOTHING * (tokens - self.edge_estimate)
+        self.edge_only_estimate += EDGE_ESTIMATE_SMOOTHING * (edge_tokens - self.edge_only_estimate)
+    
+    def edges_remaining(self) -> int:
+        """Estimate how many more edges fit, from the average size of those added.
         
-        # Check if adding the edge would exceed limit
-        return new_tokens <= self.limit
\ No newline at end of file
+        Returns:
+            Estimated number of edges the remaining budget can still take
+        """
+        return max(0, int(self.remaining() // self.edge_estimate))
+    
+    def can_add_edge_cheap(self, edge_tokens: float | None = None) -> bool:
+        """Check, without serializing anything, whether another edge is likely to fit.
+        
+        Uses the tokens accounted so far plus the average size of the edges
+        added. The node is left out of the default estimate because edges to
+        visited nodes bring none. Callers still confirm with can_add_edge;
+        this only lets them skip building edges that are bound to be rejected.
+        
+        Args:
+            edge_tokens: Estimated size of the edge (defaults to the moving
+                average of edges without their nodes)
+            
+        Returns:
+            False if the edge would almost certainly exceed the budget
+        """
+        if edge_tokens is None:
+            edge_tokens = self.edge_only_estimate
+        return (self.used + edge_tokens) <= self.limit
\ No newline at end of file
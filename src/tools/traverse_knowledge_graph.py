@@ -1,15 +1,20 @@
 """Traverse knowledge graph functionality for Graphiti MCP server."""
 
-from typing import Any, cast, TypedDict
+from datetime import datetime
+from typing import Any, NamedTuple, cast, TypedDict
 import logging
+from sys import intern
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EntityNode
 from graphiti_core.edges import EntityEdge
+from graphiti_core.helpers import parse_db_date
 from graphiti_core.search.search_config_recipes import (
     EDGE_HYBRID_SEARCH_RRF,
 )
 from graphiti_core.search.search_filters import SearchFilters
 
+from .format_flat import _iso, _node_flat_attributes
+
 
 class ErrorResponse(TypedDict):
     error: str
@@ -29,11 +34,11 @@ def format_node_result(node: EntityNode) -> dict[str, Any]:
     return {
         'uuid': node.uuid,
         'name': node.name,
-        'summary': node.summary if hasattr(node, 'summary') else '',
-        'labels': node.labels if hasattr(node, 'labels') else [],
+        'summary': getattr(node, 'summary', ''),
+        'labels': getattr(node, 'labels', []),
         'group_id': node.group_id,
-        'created_at': node.created_at.isoformat() if node.created_at else None,
-        'attributes': node.attributes if hasattr(node, 'attributes') else {},
+        'created_at': _iso(node.created_at),
+        'attributes': getattr(node, 'attributes', {}),
     }
 
 
@@ -52,10 +57,10 @@ def format_edge_for_traverse(edge: EntityEdge, target_node_data: dict[str, Any])
         'fact': edge.fact,
         'source_node_uuid': edge.source_node_uuid,
         'target_node_uuid': edge.target_node_uuid,
-        'episodes': edge.episodes if hasattr(edge, 'episodes') else [],
-        'created_at': edge.created_at.isoformat() if edge.created_at else None,
-        'valid_at': edge.valid_at.isoformat() if edge.valid_at else None,
-        'invalid_at': edge.invalid_at.isoformat() if edge.invalid_at else None,
+        'episodes': getattr(edge, 'episodes', []),
+        'created_at': _iso(edge.created_at),
+        'valid_at': _iso(edge.valid_at),
+        'invalid_at': _iso(edge.invalid_at),
         'target': target_node_data,
     }
 
@@ -82,6 +87,170 @@ async def get_node_by_uuid(
         return None
 
 
+# Projection of exactly the fields emitted by format_node_flat
+_NODE_FLAT_RETURN = """
+RETURN n.uuid AS uuid,
+       n.name AS name,
+       n.summary AS summary,
+       labels(n) AS labels,
+       n.group_id AS group_id,
+       n.created_at AS created_at,
+       properties(n) AS attributes
+"""
+
+NODE_FLAT_QUERY = "MATCH (n:Entity {uuid: $uuid})" + _NODE_FLAT_RETURN
+
+NODES_FLAT_QUERY = (
+    "UNWIND $uuids AS node_uuid\n"
+    "MATCH (n:Entity {uuid: node_uuid})" + _NODE_FLAT_RETURN
+)
+
+def _node_flat_from_record(record: Any) -> dict[str, Any]:
+    """Shape a NODE_FLAT_QUERY record like format_node_flat output."""
+    attributes = _node_flat_attributes(record['attributes'] or {})
+    created_at = parse_db_date(record['created_at'])
+    
+    return {
+        'uuid': record['uuid'],
+        'name': record['name'],
+        'summary': record['summary'] or '',
+        'labels': [intern(label) for label in record['labels'] or ()],
+        'group_id': record['group_id'],
+        'created_at': created_at.isoformat() if created_at else None,
+        'attributes': attributes,
+    }
+
+
+async def get_node_flat_by_uuid(
+    graphiti_client: Graphiti,
+    node_uuid: str,
+) -> dict[str, Any] | None:
+    """Get a node by its UUID, already shaped like format_node_flat output.
+    
+    Skips EntityNode construction entirely; the driver result is projected
+    straight into the flat response dictionary.
+    
+    Args:
+        graphiti_client: The Graphiti client instance
+        node_uuid: UUID of the node to retrieve
+        
+    Returns:
+        The flat node dictionary or None if not found
+    """
+    try:
+        records, _, _ = await graphiti_client.driver.execute_query(
+            NODE_FLAT_QUERY, uuid=node_uuid, routing_='r'
+        )
+        if not records:
+            return None
+        return _node_flat_from_record(records[0])
+    except Exception as e:
+        logger.error(f'Error getting node by UUID {node_uuid}: {str(e)}')
+        return None
+
+
+async def get_nodes_flat_by_uuids(
+    graphiti_client: Graphiti,
+    node_uuids: list[str],
+) -> dict[str, dict[str, Any]]:
+    """Get several nodes in one query, already shaped like format_node_flat output.
+    
+    Unlike get_node_flat_by_uuid this does not swallow errors, since an empty
+    result would mark every requested node as missing.
+    
+    Args:
+        graphiti_client: The Graphiti client instance
+        node_uuids: UUIDs of the nodes to retrieve
+        
+    Returns:
+        Flat node dictionaries keyed by UUID; nodes that were not found are absent
+    """
+    if not node_uuids:
+        return {}
+    records, _, _ = await graphiti_client.driver.execute_query(
+        NODES_FLAT_QUERY, uuids=node_uuids, routing_='r'
+    )
+    return {record['uuid']: _node_flat_from_record(record) for record in records}
+
+
+class FlatEdge(NamedTuple):
+    """The EntityEdge fields read by the BFS engine and format_edge_flat."""
+    uuid: str
+    name: str
+    fact: str
+    source_node_uuid: str
+    target_node_uuid: str
+    episodes: list[str]
+    created_at: datetime | None
+    valid_at: datetime | None
+    invalid_at: datetime | None
+
+
+# Same rows as EntityEdge.get_by_node_uuid for each uuid, so n is always the
+# queried node and becomes the edge's source_node_uuid. Only the fields of
+# FlatEdge are projected; properties(e) would also ship fact_embedding
+EDGES_BY_NODES_QUERY = """
+UNWIND $uuids AS node_uuid
+MATCH (n:Entity {uuid: node_uuid})-[e:RELATES_TO]-(m:Entity)
+RETURN e.uuid AS uuid,
+       e.name AS name,
+       e.fact AS fact,
+       n.uuid AS source_node_uuid,
+       m.uuid AS target_node_uuid,
+       e.episodes AS episodes,
+       e.created_at AS created_at,
+       e.valid_at AS valid_at,
+       e.invalid_at AS invalid_at
+"""
+
+
+def _flat_edge_from_record(record: Any) -> FlatEdge:
+    """Build a FlatEdge from an EDGES_BY_NODES_QUERY record."""
+    return FlatEdge(
+        uuid=record['uuid'],
+        name=intern(record['name']),
+        fact=record['fact'],
+        source_node_uuid=record['source_node_uuid'],
+        target_node_uuid=record['target_node_uuid'],
+        episodes=record['episodes'] or [],
+        created_at=parse_db_date(record['created_at']),
+        valid_at=parse_db_date(record['valid_at']),
+        invalid_at=parse_db_date(record['invalid_at']),
+    )
+
+
+async def get_edges_by_node_uuids(
+    graphiti_client: Graphiti,
+    node_uuids: list[str],
+) -> dict[str, list[FlatEdge]]:
+    """Get the edges of several nodes in one query.
+    
+    Edges come back as FlatEdge tuples rather than EntityEdge models, which
+    skips model validation and the embedding and attribute payload.
+    
+    Unlike the node fetchers this does not swallow errors, since an empty
+    result would be indistinguishable from nodes without edges.
+    
+    Args:
+        graphiti_client: The Graphiti client instance
+        node_uuids: UUIDs of the nodes whose edges to retrieve
+        
+    Returns:
+        Edge lists keyed by node UUID; nodes without edges are absent
+    """
+    if not node_uuids:
+        return {}
+    records, _, _ = await graphiti_client.driver.execute_query(
+        EDGES_BY_NODES_QUERY, uuids=node_uuids, routing_='r'
+    )
+    edges: dict[str, list[FlatEdge]] = {}
+    for record in records:
+        edges.setdefault(record['source_node_uuid'], []).append(
+            _flat_edge_from_record(record)
+        )
+    return edges
+
+
 async def traverse_knowledge_graph_impl(
     graphiti_client: Graphiti,
     start_node_uuid: str | None = None,
@@ -114,6 +283,9 @@ async def traverse_knowledge_graph_impl(
             format_node_result=format_node_result,
             format_edge_for_traverse=format_edge_for_traverse,
             get_node_by_uuid=get_node_by_uuid,
+            get_node_flat_by_uuid=get_node_flat_by_uuid,
+            get_nodes_flat_by_uuids=get_nodes_flat_by_uuids,
+            get_edges_by_node_uuids=get_edges_by_node_uuids,
         )
     except CursorExpired as e:
         return {'error': f'CURSOR_EXPIRED: {str(e)}'}
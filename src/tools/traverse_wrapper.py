@@ -1,5 +1,6 @@
 """Cursor-based pagination wrapper for traverse_knowledge_graph."""
 
+import os
 import time
 import uuid
 import logging
@@ -10,12 +11,13 @@ from .session_store import (
     TraverseSession,
     Frame,
     SessionStore,
+    RedisSessionStore,
     CursorExpired,
     InvalidCursor,
     SessionNotFound,
     QueryMismatch,
 )
-from .engine_bfs import advance_bfs
+from .engine_bfs import advance_bfs, fetch_root_node
 from .token_budget import TokenBudget, estimate_tokens
 from .traverse_knowledge_graph import (
     format_node_result,
@@ -26,8 +28,50 @@ from .traverse_knowledge_graph import (
 
 logger = logging.getLogger(__name__)
 
-# Global session store (in production, use Redis or similar)
-_session_store = SessionStore()
+
+def _create_session_store() -> SessionStore:
+    """Create the session store, falling back to in-memory storage if redis is unavailable."""
+    redis_url = os.environ.get("TRAVERSE_SESSION_REDIS_URL")
+    if not redis_url:
+        return SessionStore()
+    try:
+        return RedisSessionStore(url=redis_url)
+    except ImportError:
+        logger.warning(
+            "TRAVERSE_SESSION_REDIS_URL is set but the redis package is not installed; "
+            "using in-process session storage"
+        )
+        return SessionStore()
+
+
+# Global session store; set TRAVERSE_SESSION_REDIS_URL to share cursors
+# between server processes
+_session_store = _create_session_store()
+
+
+async def _lookup_node(
+    graphiti_client: Graphiti,
+    node_uuid: str,
+    *,
+    get_node_by_uuid,
+    get_node_flat_by_uuid=None,
+) -> Dict[str, Any]:
+    """Build the complete response of a depth 0 traversal (the node alone)."""
+    node_data = await fetch_root_node(
+        graphiti_client,
+        node_uuid,
+        get_node_by_uuid=get_node_by_uuid,
+        get_node_flat_by_uuid=get_node_flat_by_uuid,
+    )
+    
+    response: Dict[str, Any] = {
+        "start": node_uuid,
+        "nodes": {node_uuid: node_data},
+        "edges": [],
+    }
+    response["usage"] = {"estimated_tokens": estimate_tokens(response)}
+    response["cursor"] = {"has_more": False}
+    return response
 
 
 async def traverse_knowledge_graph_paginated(
@@ -39,6 +83,9 @@ async def traverse_knowledge_graph_paginated(
     format_node_result,
     format_edge_for_traverse,
     get_node_by_uuid,
+    get_node_flat_by_uuid=None,
+    get_nodes_flat_by_uuids=None,
+    get_edges_by_node_uuids=None,
 ) -> Dict[str, Any]:
     """Traverse knowledge graph with cursor-based pagination.
     
@@ -52,6 +99,9 @@ async def traverse_knowledge_graph_paginated(
         format_node_result: Function to format node results
         format_edge_for_traverse: Function to format edge results
         get_node_by_uuid: Function to get node by UUID
+        get_node_flat_by_uuid: Optional function returning a node already in flat format
+        get_nodes_flat_by_uuids: Optional function fetching several flat nodes at once
+        get_edges_by_node_uuids: Optional function fetching the edges of several nodes at once
         
     Returns:
         Dictionary with:
@@ -95,6 +145,16 @@ async def traverse_knowledge_graph_paginated(
         if depth < 0 or depth > 5:
             raise ValueError("depth must be between 0 and 5")
         
+        # Depth 0 is a plain node lookup; it never paginates, so skip the
+        # session and the engine entirely
+        if depth == 0:
+            return await _lookup_node(
+                graphiti_client,
+                start_node_uuid,
+                get_node_by_uuid=get_node_by_uuid,
+                get_node_flat_by_uuid=get_node_flat_by_uuid,
+            )
+        
         # Create new session
         session_id = str(uuid.uuid4())
         sess = TraverseSession(
@@ -104,7 +164,7 @@ async def traverse_knowledge_graph_paginated(
             edge_ordering="uuid",  # Could be configurable
             query_hash=f"{start_node_uuid}:{depth}",
             frontier=[],
-            visited=[],
+            visited=set(),
             yielded_edges=0,
             started_at=time.time(),
             expires_at=time.time() + 3600,  # 1 hour TTL
@@ -117,6 +177,9 @@ async def traverse_knowledge_graph_paginated(
         format_node_result=format_node_result,
         format_edge_for_traverse=format_edge_for_traverse,
         get_node_by_uuid=get_node_by_uuid,
+        get_node_flat_by_uuid=get_node_flat_by_uuid,
+        get_nodes_flat_by_uuids=get_nodes_flat_by_uuids,
+        get_edges_by_node_uuids=get_edges_by_node_uuids,
         budget=TokenBudget(),  # Uses default 20,000 token limit
     )
     